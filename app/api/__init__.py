@@ -1,5 +1,6 @@
 """API module exports."""
 
 from app.api.image_analysis import router as image_analysis_router
+from app.api.image_analysis import warm_up_analysis
 
-__all__ = ["image_analysis_router"]
+__all__ = ["image_analysis_router", "warm_up_analysis"]
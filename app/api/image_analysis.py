@@ -5,13 +5,18 @@ Privacy-First Design:
 - Image data is immediately discarded after analysis completes
 - No user tracking, sessions, or request history
 - All processing is stateless and isolated per request
-- Cache keys are SHA-256 hashes of image content; URLs and filenames are
+- Cache keys are BLAKE2b hashes of request parameters; URLs and filenames are
   never stored in the cache
+- Cached per-image statistics are luminance level counts and edge averages
+  only; pixel data is never cached
 """
 
+import asyncio
 import io
 import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, Any
 
 import numpy as np
@@ -21,15 +26,20 @@ from pydantic import BaseModel, Field
 
 from app.config import settings
 from app.core import (
+    EDGE_MODES,
     ImageAnalysisCache,
-    calculate_average_luminance,
+    calculate_average_luminance_from_counts,
     calculate_brightness_score,
-    calculate_edge_luminance,
-    calculate_histogram,
+    calculate_edge_luminance_sum,
+    calculate_histogram_from_counts,
     calculate_luminance,
-    calculate_median_luminance,
+    calculate_luminance_counts,
+    calculate_median_luminance_from_counts,
     compute_cache_key,
+    compute_content_key,
+    new_content_hasher,
     redact_url_for_logging,
+    request_scaled_decode,
     resize_image_if_needed,
     validate_and_download_from_url,
     validate_edge_mode,
@@ -47,6 +57,25 @@ _cache = ImageAnalysisCache(
     ttl_seconds=settings.CACHE_TTL_SECONDS,
 )
 
+# Worker threads for image decoding and analysis. PIL and NumPy release the GIL
+# in their C loops, so requests are analyzed in parallel while the event loop
+# stays free; one worker per core keeps CPU-bound work from oversubscribing.
+_cpu_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="analysis")
+
+# Errors Pillow raises for unreadable, truncated, corrupt or oversized images
+# (UnidentifiedImageError is an OSError; some PNG chunk errors are SyntaxErrors)
+_DECODE_ERRORS = (OSError, ValueError, SyntaxError, Image.DecompressionBombError)
+
+# Image modes analyzed without a PIL conversion to RGB
+_NATIVE_MODES = ("RGB", "L")
+
+# Per-image aggregate statistics keyed by content hash, so one decode serves
+# every metric combination and edge mode requested for the same image
+_stats_cache = ImageAnalysisCache(
+    max_size=settings.CACHE_MAX_SIZE,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+)
+
 
 class ImageUrlRequest(BaseModel):
     """Request model for URL-based image analysis."""
@@ -61,86 +90,201 @@ class ImageUrlRequest(BaseModel):
     )
 
 
-def _process_image_bytes(
-    contents: bytes,
-    requested_metrics: set[str],
-    validated_edge_mode: str | None,
-) -> dict[str, Any]:
+class ImageUrlBatchRequest(BaseModel):
+    """Request model for batch URL-based image analysis."""
+
+    urls: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.MAX_BATCH_SIZE,
+        description="URLs of the images to analyze (JPEG or PNG)",
+    )
+    metrics: str | None = Field(
+        None, description="Comma-separated metrics: brightness, median, histogram"
+    )
+    edge_mode: str | None = Field(
+        None,
+        description="Edge-based brightness mode: left_right, top_bottom, or all (analyzes 10% of edges)",
+    )
+
+
+def _elapsed_ms(start_ns: int) -> float:
+    """Return milliseconds elapsed since a ``time.perf_counter_ns()`` reading."""
+    return round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
+
+
+def _analyze_image_bytes(contents: bytes, edge_modes: tuple[str, ...]) -> dict[str, Any]:
     """
-    Process image bytes and return analysis results.
+    Decode image bytes and reduce them to per-image aggregate statistics.
 
-    **Privacy-First Processing:**
-    - Image data exists only in-memory during this function execution
-    - No disk writes, database storage, or external uploads
-    - All image data is discarded when function returns (garbage collected)
-    - Only aggregate metrics are returned, never pixel data
+    The statistics are independent of the requested metrics, so they can be
+    cached per image and reused for any metric combination or edge mode.
 
     Args:
         contents: Raw image bytes (immediately discarded after analysis)
-        requested_metrics: Set of metrics to calculate
-        validated_edge_mode: Validated edge mode (if any)
+        edge_modes: Edge modes to reduce; all of them when the statistics
+            are cached, otherwise only the requested one
 
     Returns:
-        Dictionary with analysis results (no image data included)
+        Dictionary with the 256 per-level luminance counts, the average edge
+        luminance for each of ``edge_modes``, and the original image dimensions
     """
     # Parse image
     try:
         img = Image.open(io.BytesIO(contents))
 
-        # Convert to RGB (handles RGBA, grayscale, etc.)
-        img = img.convert("RGB")
-    except Exception as e:
+        # Store original dimensions before any scaled decode shrinks them
+        original_width, original_height = img.size
+
+        # Let JPEGs decode straight to (near) the resize target
+        request_scaled_decode(img)
+
+        # Force the decode here so corrupt data is reported as a 400
+        img.load()
+
+        # Convert to RGB (handles RGBA, palette, etc.). RGB needs no conversion
+        # and grayscale is expanded for free below, so neither is copied here.
+        if img.mode not in _NATIVE_MODES:
+            img = img.convert("RGB")
+    except _DECODE_ERRORS as e:
         raise HTTPException(
             status_code=400,
             detail={"error": "Invalid or corrupted image file", "details": str(e)},
         ) from e
 
-    # Store original dimensions
-    original_width, original_height = img.size
-
     if settings.ENABLE_DETAILED_LOGGING:
-        logger.info(f"Image loaded - Original dimensions: {original_width}x{original_height}")
+        logger.info("Image loaded - Original dimensions: %dx%d", original_width, original_height)
 
     # Resize if needed for performance
     img = resize_image_if_needed(img)
 
     if img.size != (original_width, original_height) and settings.ENABLE_DETAILED_LOGGING:
-        logger.info(f"Image resized - New dimensions: {img.size[0]}x{img.size[1]}")
+        logger.info("Image resized - New dimensions: %dx%d", *img.size)
+
+    # Convert to numpy array. np.asarray wraps PIL's buffer via the array
+    # interface instead of making a second full-image copy like np.array.
+    rgb_array = np.asarray(img)
+    if rgb_array.ndim == 2:
+        # Grayscale: repeat the single channel as a zero-copy strided view
+        rgb_array = np.broadcast_to(rgb_array[..., np.newaxis], (*rgb_array.shape, 3))
+
+    # Optionally decimate before analysis. Every metric, edge averages included,
+    # is then computed from the sample and is approximate; at 0.01 luminance
+    # precision and 10 histogram buckets the difference is usually negligible.
+    if settings.FAST_STATS:
+        stride = settings.FAST_STATS_STRIDE
+        rgb_array = rgb_array[::stride, ::stride]
+
+    # Calculate luminance, then count each luminance level in one pass;
+    # mean, median and histogram are all derived from the same counts
+    luminance = calculate_luminance(rgb_array)
+    level_counts = calculate_luminance_counts(luminance)
 
-    # Convert to numpy array
-    rgb_array = np.array(img)
+    edge_averages = {}
+    for mode in edge_modes:
+        edge_total, edge_count = calculate_edge_luminance_sum(luminance, mode)
+        edge_averages[mode] = edge_total / edge_count
 
-    # Calculate luminance
-    luminance = calculate_luminance(rgb_array)
+    return {
+        "level_counts": level_counts,
+        "edge_average_luminance": edge_averages,
+        "width": original_width,
+        "height": original_height,
+    }
+
+
+def _warm_up() -> None:
+    """Analyze tiny generated JPEG and PNG images once; nothing is cached."""
+    for image_format in ("JPEG", "PNG"):
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8)).save(buffer, format=image_format)
+        _analyze_image_bytes(buffer.getvalue(), EDGE_MODES)
+
+
+async def warm_up_analysis() -> None:
+    """
+    Run the analysis pipeline once on the worker pool at startup.
+
+    The first real request otherwise pays one-time costs on the request path:
+    Pillow's lazy codec plugin registration, NumPy's first dispatch of each
+    kernel, and spawning an analysis worker thread.
+    """
+    await asyncio.get_running_loop().run_in_executor(_cpu_pool, _warm_up)
+
+
+def _process_image_bytes(
+    contents: bytes,
+    requested_metrics: frozenset[str],
+    validated_edge_mode: str | None,
+    content_key: str | None = None,
+) -> dict[str, Any]:
+    """
+    Process image bytes and return analysis results.
+
+    **Privacy-First Processing:**
+    - Image data exists only in-memory during this function execution
+    - No disk writes, database storage, or external uploads
+    - All image data is discarded when function returns (garbage collected)
+    - Only aggregate metrics are returned, never pixel data
+
+    When caching is enabled, the per-image statistics are cached under a hash
+    of the image content, so the same image requested with a different metric
+    combination or edge mode skips decoding entirely.
+
+    Args:
+        contents: Raw image bytes (immediately discarded after analysis)
+        requested_metrics: Set of metrics to calculate
+        validated_edge_mode: Validated edge mode (if any)
+        content_key: Precomputed :func:`compute_content_key` of ``contents``,
+            if the caller already hashed the bytes
+
+    Returns:
+        Dictionary with analysis results (no image data included)
+    """
+    if settings.CACHE_ENABLED:
+        if content_key is None:
+            content_key = compute_content_key(contents)
+        stats = _stats_cache.get(content_key)
+        if stats is None:
+            # Cached statistics must serve any later edge mode, so reduce them all
+            stats = _analyze_image_bytes(contents, EDGE_MODES)
+            _stats_cache.set(content_key, stats)
+    else:
+        # Nothing is reused, so only the requested reductions are computed
+        edge_modes = (validated_edge_mode,) if validated_edge_mode else ()
+        stats = _analyze_image_bytes(contents, edge_modes)
+
+    level_counts = stats["level_counts"]
 
     # Build response with requested metrics
     response: dict[str, Any] = {}
 
     # Brightness is always included with brightness metric
     if "brightness" in requested_metrics:
-        avg_luminance = calculate_average_luminance(luminance)
+        avg_luminance = calculate_average_luminance_from_counts(level_counts)
         response["brightness_score"] = calculate_brightness_score(avg_luminance)
         response["average_luminance"] = round(avg_luminance, 2)
 
     # Edge-based brightness if requested
     if validated_edge_mode:
-        edge_luminance_values = calculate_edge_luminance(luminance, validated_edge_mode)
-        edge_avg_luminance = float(edge_luminance_values.mean())
+        edge_avg_luminance = stats["edge_average_luminance"][validated_edge_mode]
         response["edge_brightness_score"] = calculate_brightness_score(edge_avg_luminance)
         response["edge_average_luminance"] = round(edge_avg_luminance, 2)
         response["edge_mode"] = validated_edge_mode
 
     # Median luminance
     if "median" in requested_metrics:
-        response["median_luminance"] = round(calculate_median_luminance(luminance), 2)
+        response["median_luminance"] = round(
+            calculate_median_luminance_from_counts(level_counts), 2
+        )
 
     # Histogram
     if "histogram" in requested_metrics:
-        response["histogram"] = calculate_histogram(luminance)
+        response["histogram"] = calculate_histogram_from_counts(level_counts)
 
     # Always include metadata
-    response["width"] = original_width
-    response["height"] = original_height
+    response["width"] = stats["width"]
+    response["height"] = stats["height"]
     response["algorithm"] = settings.LUMINANCE_ALGORITHM
 
     return response
@@ -159,7 +303,7 @@ def _process_image_bytes(
                             "summary": "Brightness metric only",
                             "value": {
                                 "brightness_score": 57,
-                                "average_luminance": 146.28,
+                                "average_luminance": 146.27,
                                 "width": 536,
                                 "height": 354,
                                 "algorithm": "rec709",
@@ -170,8 +314,8 @@ def _process_image_bytes(
                             "summary": "Brightness and median metrics",
                             "value": {
                                 "brightness_score": 57,
-                                "average_luminance": 146.28,
-                                "median_luminance": 165.88,
+                                "average_luminance": 146.27,
+                                "median_luminance": 166.0,
                                 "width": 536,
                                 "height": 354,
                                 "algorithm": "rec709",
@@ -182,19 +326,19 @@ def _process_image_bytes(
                             "summary": "Full analysis with histogram",
                             "value": {
                                 "brightness_score": 57,
-                                "average_luminance": 146.28,
-                                "median_luminance": 165.88,
+                                "average_luminance": 146.27,
+                                "median_luminance": 166.0,
                                 "histogram": [
                                     {"range": "0-24", "percent": 0.2},
-                                    {"range": "25-50", "percent": 13.1},
-                                    {"range": "51-75", "percent": 15.6},
+                                    {"range": "25-50", "percent": 10.4},
+                                    {"range": "51-75", "percent": 16.3},
                                     {"range": "76-101", "percent": 3.0},
-                                    {"range": "102-127", "percent": 3.3},
-                                    {"range": "128-152", "percent": 11.5},
-                                    {"range": "153-178", "percent": 11.9},
-                                    {"range": "179-203", "percent": 24.8},
-                                    {"range": "204-229", "percent": 15.5},
-                                    {"range": "230-255", "percent": 4.5},
+                                    {"range": "102-127", "percent": 3.2},
+                                    {"range": "128-152", "percent": 11.3},
+                                    {"range": "153-178", "percent": 11.6},
+                                    {"range": "179-203", "percent": 23.9},
+                                    {"range": "204-229", "percent": 15.6},
+                                    {"range": "230-255", "percent": 4.7},
                                 ],
                                 "width": 536,
                                 "height": 354,
@@ -206,22 +350,22 @@ def _process_image_bytes(
                             "summary": "Analysis with edge-based brightness",
                             "value": {
                                 "brightness_score": 57,
-                                "average_luminance": 146.28,
-                                "median_luminance": 165.88,
+                                "average_luminance": 146.27,
+                                "median_luminance": 166.0,
                                 "histogram": [
                                     {"range": "0-24", "percent": 0.2},
-                                    {"range": "25-50", "percent": 13.1},
-                                    {"range": "51-75", "percent": 15.6},
+                                    {"range": "25-50", "percent": 10.4},
+                                    {"range": "51-75", "percent": 16.3},
                                     {"range": "76-101", "percent": 3.0},
-                                    {"range": "102-127", "percent": 3.3},
-                                    {"range": "128-152", "percent": 11.5},
-                                    {"range": "153-178", "percent": 11.9},
-                                    {"range": "179-203", "percent": 24.8},
-                                    {"range": "204-229", "percent": 15.5},
-                                    {"range": "230-255", "percent": 4.5},
+                                    {"range": "102-127", "percent": 3.2},
+                                    {"range": "128-152", "percent": 11.3},
+                                    {"range": "153-178", "percent": 11.6},
+                                    {"range": "179-203", "percent": 23.9},
+                                    {"range": "204-229", "percent": 15.6},
+                                    {"range": "230-255", "percent": 4.7},
                                 ],
                                 "edge_brightness_score": 51,
-                                "edge_average_luminance": 130.18,
+                                "edge_average_luminance": 130.17,
                                 "edge_mode": "all",
                                 "width": 536,
                                 "height": 354,
@@ -267,12 +411,14 @@ async def analyze_image(
 
     Returns deterministic results for the same input image.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     if settings.ENABLE_DETAILED_LOGGING:
         logger.info(
-            f"Image analysis request started - File: {image.filename}, "
-            f"Metrics: {metrics}, Edge mode: {edge_mode}"
+            "Image analysis request started - File: %s, Metrics: %s, Edge mode: %s",
+            image.filename,
+            metrics,
+            edge_mode,
         )
 
     # Validate metrics parameter
@@ -281,35 +427,77 @@ async def analyze_image(
     # Validate edge_mode parameter
     validated_edge_mode = validate_edge_mode(edge_mode)
 
+    return await _analyze_upload(image, requested_metrics, validated_edge_mode, start_ns)
+
+
+async def _analyze_upload(
+    image: UploadFile,
+    requested_metrics: frozenset[str],
+    validated_edge_mode: str | None,
+    start_ns: int | None = None,
+) -> dict[str, Any]:
+    """
+    Analyze one uploaded image with already validated parameters.
+
+    Shared by the single and batch upload endpoints.
+
+    Args:
+        image: Uploaded image file
+        requested_metrics: Set of metrics to calculate
+        validated_edge_mode: Validated edge mode (if any)
+        start_ns: ``time.perf_counter_ns()`` reading the processing time is measured from;
+            defaults to when this call starts (each batch item is timed on its own)
+
+    Returns:
+        Dictionary with analysis results (no image data included)
+
+    Raises:
+        HTTPException: If image validation fails
+    """
+    if start_ns is None:
+        start_ns = time.perf_counter_ns()
+
     # Validate and read image
     contents = await validate_image_upload(image)
-    file_size_mb = len(contents) / (1024 * 1024)
 
     if settings.ENABLE_DETAILED_LOGGING:
         logger.info(
-            f"File validated - Size: {file_size_mb:.2f}MB, Content-Type: {image.content_type}"
+            "File validated - Size: %.2fMB, Content-Type: %s",
+            len(contents) / (1024 * 1024),
+            image.content_type,
         )
 
-    # Check cache before processing (key is based on content hash, not filename)
+    # Check cache before processing (key is based on content hash, not filename).
+    # The content key is hashed once and shared with the image statistics cache.
     cache_key = ""
+    content_key = None
     if settings.CACHE_ENABLED:
+        content_key = compute_content_key(contents)
         cache_key = compute_cache_key(
-            metrics=requested_metrics, edge_mode=validated_edge_mode, image_bytes=contents
+            metrics=requested_metrics, edge_mode=validated_edge_mode, content_key=content_key
         )
         cached = _cache.get(cache_key)
         if cached is not None:
-            elapsed_time = time.time() - start_time
             response = cached
-            response["processing_time_ms"] = round(elapsed_time * 1000, 2)
+            response["processing_time_ms"] = _elapsed_ms(start_ns)
             response["cached"] = True
             if settings.ENABLE_DETAILED_LOGGING:
                 logger.info(
-                    f"Cache hit - Key: {cache_key[:16]}…, Duration: {response['processing_time_ms']}ms"
+                    "Cache hit - Key: %s…, Duration: %sms",
+                    cache_key[:16],
+                    response["processing_time_ms"],
                 )
             return response
 
-    # Process image and get results
-    response = _process_image_bytes(contents, requested_metrics, validated_edge_mode)
+    # Process image off the event loop and get results
+    response = await asyncio.get_running_loop().run_in_executor(
+        _cpu_pool,
+        _process_image_bytes,
+        contents,
+        requested_metrics,
+        validated_edge_mode,
+        content_key,
+    )
     # Mark as a fresh result before caching; also ensures the field is always
     # present in the response even when CACHE_ENABLED is False.
     response["cached"] = False
@@ -319,23 +507,85 @@ async def analyze_image(
         _cache.set(cache_key, response)
 
     # Calculate and add processing time
-    elapsed_time = time.time() - start_time
-    processing_time_ms = round(elapsed_time * 1000, 2)
+    processing_time_ms = _elapsed_ms(start_ns)
     response["processing_time_ms"] = processing_time_ms
 
     if settings.ENABLE_DETAILED_LOGGING:
-        metrics_used = ", ".join(requested_metrics)
-        edge_info = f", Edge mode: {validated_edge_mode}" if validated_edge_mode else ""
         logger.info(
-            f"Image analysis completed - Metrics: {metrics_used}{edge_info}, "
-            f"Duration: {processing_time_ms}ms, "
-            f"Dimensions: {response['width']}x{response['height']}, "
-            f"Algorithm: {settings.LUMINANCE_ALGORITHM}"
+            "Image analysis completed - Metrics: %s%s, Duration: %sms, "
+            "Dimensions: %dx%d, Algorithm: %s",
+            ", ".join(requested_metrics),
+            f", Edge mode: {validated_edge_mode}" if validated_edge_mode else "",
+            processing_time_ms,
+            response["width"],
+            response["height"],
+            settings.LUMINANCE_ALGORITHM,
         )
 
     return response
 
 
+@router.post("/analysis/batch")
+async def analyze_images(
+    images: Annotated[list[UploadFile], File(description="JPEG or PNG images to analyze")],
+    metrics: Annotated[
+        str | None,
+        Query(description="Comma-separated metrics: brightness, median, histogram"),
+    ] = None,
+    edge_mode: Annotated[
+        str | None,
+        Query(
+            description="Edge-based brightness mode: left_right, top_bottom, or all (analyzes 10% of edges)"
+        ),
+    ] = None,
+) -> dict[str, Any]:
+    """
+    Analyze several uploaded images in one request.
+
+    Each image is analyzed exactly as by ``POST /v1/image/analysis``, with the
+    same metrics and edge mode. Sending small images together saves a
+    request and a multipart parse per image.
+
+    Returns:
+        Dictionary with one entry per image, in upload order, and the total
+        processing time. An entry is either the analysis result or
+        ``{"status_code", "detail"}`` describing why that image failed.
+
+    Raises:
+        HTTPException: If too many images are sent or the metrics or
+            edge_mode parameters are invalid
+    """
+    start_ns = time.perf_counter_ns()
+
+    if settings.ENABLE_DETAILED_LOGGING:
+        logger.info(
+            "Batch image analysis request started - Files: %d, Metrics: %s, Edge mode: %s",
+            len(images),
+            metrics,
+            edge_mode,
+        )
+
+    if len(images) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Too many images",
+                "max_images": settings.MAX_BATCH_SIZE,
+                "received_images": len(images),
+            },
+        )
+
+    requested_metrics = validate_metrics(metrics)
+    validated_edge_mode = validate_edge_mode(edge_mode)
+
+    outcomes = await asyncio.gather(
+        *(_analyze_upload(image, requested_metrics, validated_edge_mode) for image in images),
+        return_exceptions=True,
+    )
+
+    return {"results": _batch_results(outcomes), "processing_time_ms": _elapsed_ms(start_ns)}
+
+
 @router.post(
     "/analysis/url",
     summary="Analyze Image from URL",
@@ -360,22 +610,22 @@ async def analyze_image(
                             "summary": "Full analysis with all metrics",
                             "value": {
                                 "brightness_score": 57,
-                                "average_luminance": 146.28,
-                                "median_luminance": 165.88,
+                                "average_luminance": 146.27,
+                                "median_luminance": 166.0,
                                 "histogram": [
                                     {"range": "0-24", "percent": 0.2},
-                                    {"range": "25-50", "percent": 13.1},
-                                    {"range": "51-75", "percent": 15.6},
+                                    {"range": "25-50", "percent": 10.4},
+                                    {"range": "51-75", "percent": 16.3},
                                     {"range": "76-101", "percent": 3.0},
-                                    {"range": "102-127", "percent": 3.3},
-                                    {"range": "128-152", "percent": 11.5},
-                                    {"range": "153-178", "percent": 11.9},
-                                    {"range": "179-203", "percent": 24.8},
-                                    {"range": "204-229", "percent": 15.5},
-                                    {"range": "230-255", "percent": 4.5},
+                                    {"range": "102-127", "percent": 3.2},
+                                    {"range": "128-152", "percent": 11.3},
+                                    {"range": "153-178", "percent": 11.6},
+                                    {"range": "179-203", "percent": 23.9},
+                                    {"range": "204-229", "percent": 15.6},
+                                    {"range": "230-255", "percent": 4.7},
                                 ],
                                 "edge_brightness_score": 51,
-                                "edge_average_luminance": 130.18,
+                                "edge_average_luminance": 130.17,
                                 "edge_mode": "all",
                                 "width": 536,
                                 "height": 354,
@@ -409,15 +659,14 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> dict[str, Any]:
 
     Returns deterministic results for the same input image.
     """
-    start_time = time.time()
-
-    # Redact URL for safe logging
-    redacted_url = redact_url_for_logging(request.url)
+    start_ns = time.perf_counter_ns()
 
     if settings.ENABLE_DETAILED_LOGGING:
         logger.info(
-            f"Image analysis request started - URL: {redacted_url}, "
-            f"Metrics: {request.metrics}, Edge mode: {request.edge_mode}"
+            "Image analysis request started - URL: %s, Metrics: %s, Edge mode: %s",
+            redact_url_for_logging(request.url),
+            request.metrics,
+            request.edge_mode,
         )
 
     # Validate metrics parameter
@@ -426,36 +675,80 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> dict[str, Any]:
     # Validate edge_mode parameter
     validated_edge_mode = validate_edge_mode(request.edge_mode)
 
+    return await _analyze_url(request.url, requested_metrics, validated_edge_mode, start_ns)
+
+
+async def _analyze_url(
+    url: str,
+    requested_metrics: frozenset[str],
+    validated_edge_mode: str | None,
+    start_ns: int | None = None,
+) -> dict[str, Any]:
+    """
+    Analyze one image URL with already validated parameters.
+
+    Shared by the single and batch URL endpoints.
+
+    Args:
+        url: URL of the image to analyze
+        requested_metrics: Set of metrics to calculate
+        validated_edge_mode: Validated edge mode (if any)
+        start_ns: ``time.perf_counter_ns()`` reading the processing time is measured from;
+            defaults to when this call starts (each batch item is timed on its own)
+
+    Returns:
+        Dictionary with analysis results (no image data included)
+
+    Raises:
+        HTTPException: If the download or image validation fails
+    """
+    if start_ns is None:
+        start_ns = time.perf_counter_ns()
+
+    # Redact URL for safe logging (only parsed when it will be logged)
+    redacted_url = redact_url_for_logging(url) if settings.ENABLE_DETAILED_LOGGING else ""
+
     # Check analysis cache BEFORE downloading (key is based on URL, not content)
     # This allows cache hits without downloading the image at all
     cache_key = ""
     if settings.CACHE_ENABLED:
         cache_key = compute_cache_key(
-            metrics=requested_metrics, edge_mode=validated_edge_mode, url=request.url
+            metrics=requested_metrics, edge_mode=validated_edge_mode, url=url
         )
         cached = _cache.get(cache_key)
         if cached is not None:
-            elapsed_time = time.time() - start_time
             response = cached
-            response["processing_time_ms"] = round(elapsed_time * 1000, 2)
+            response["processing_time_ms"] = _elapsed_ms(start_ns)
             response["cached"] = True
             if settings.ENABLE_DETAILED_LOGGING:
                 logger.info(
-                    f"Cache hit - URL: {redacted_url}, Key: {cache_key[:16]}…, "
-                    f"Duration: {response['processing_time_ms']}ms (no download needed)"
+                    "Cache hit - URL: %s, Key: %s…, Duration: %sms (no download needed)",
+                    redacted_url,
+                    cache_key[:16],
+                    response["processing_time_ms"],
                 )
             return response
 
-    # Cache miss - download and analyze the image
-    contents = await validate_and_download_from_url(request.url)
-
-    file_size_mb = len(contents) / (1024 * 1024)
+    # Cache miss - download and analyze the image, hashing the content as it
+    # streams in so the image statistics cache needs no second pass
+    hasher = new_content_hasher() if settings.CACHE_ENABLED else None
+    contents = await validate_and_download_from_url(url, hasher=hasher)
+    content_key = hasher.hexdigest() if hasher is not None else None
 
     if settings.ENABLE_DETAILED_LOGGING:
-        logger.info(f"Image downloaded - Size: {file_size_mb:.2f}MB, URL: {redacted_url}")
+        logger.info(
+            "Image downloaded - Size: %.2fMB, URL: %s", len(contents) / (1024 * 1024), redacted_url
+        )
 
-    # Process image and get results
-    response = _process_image_bytes(contents, requested_metrics, validated_edge_mode)
+    # Process image off the event loop and get results
+    response = await asyncio.get_running_loop().run_in_executor(
+        _cpu_pool,
+        _process_image_bytes,
+        contents,
+        requested_metrics,
+        validated_edge_mode,
+        content_key,
+    )
     # Mark as a fresh result before caching; also ensures the field is always
     # present in the response even when CACHE_ENABLED is False.
     response["cached"] = False
@@ -465,18 +758,80 @@ async def analyze_image_from_url(request: ImageUrlRequest) -> dict[str, Any]:
         _cache.set(cache_key, response)
 
     # Calculate and add processing time
-    elapsed_time = time.time() - start_time
-    processing_time_ms = round(elapsed_time * 1000, 2)
+    processing_time_ms = _elapsed_ms(start_ns)
     response["processing_time_ms"] = processing_time_ms
 
     if settings.ENABLE_DETAILED_LOGGING:
-        metrics_used = ", ".join(requested_metrics)
-        edge_info = f", Edge mode: {validated_edge_mode}" if validated_edge_mode else ""
         logger.info(
-            f"Image analysis completed - Metrics: {metrics_used}{edge_info}, "
-            f"Duration: {processing_time_ms}ms, "
-            f"Dimensions: {response['width']}x{response['height']}, "
-            f"Algorithm: {settings.LUMINANCE_ALGORITHM}"
+            "Image analysis completed - Metrics: %s%s, Duration: %sms, "
+            "Dimensions: %dx%d, Algorithm: %s",
+            ", ".join(requested_metrics),
+            f", Edge mode: {validated_edge_mode}" if validated_edge_mode else "",
+            processing_time_ms,
+            response["width"],
+            response["height"],
+            settings.LUMINANCE_ALGORITHM,
         )
 
     return response
+
+
+@router.post("/analysis/url/batch")
+async def analyze_images_from_urls(request: ImageUrlBatchRequest) -> dict[str, Any]:
+    """
+    Analyze several images from URLs in one request.
+
+    The images are downloaded concurrently over the shared HTTP client and
+    analyzed exactly as by ``POST /v1/image/analysis/url``. Downloads from the
+    same host are still limited by ``MAX_DOWNLOADS_PER_HOST``.
+
+    Privacy: URLs are not echoed back; results are returned in request order.
+
+    Args:
+        request: JSON body with the image URLs and optional metrics/edge_mode parameters
+
+    Returns:
+        Dictionary with one entry per URL and the total processing time. An
+        entry is either the analysis result or ``{"status_code", "detail"}``
+        describing why that URL failed.
+
+    Raises:
+        HTTPException: If the metrics or edge_mode parameters are invalid
+    """
+    start_ns = time.perf_counter_ns()
+
+    if settings.ENABLE_DETAILED_LOGGING:
+        logger.info(
+            "Batch image analysis request started - URLs: %d, Metrics: %s, Edge mode: %s",
+            len(request.urls),
+            request.metrics,
+            request.edge_mode,
+        )
+
+    requested_metrics = validate_metrics(request.metrics)
+    validated_edge_mode = validate_edge_mode(request.edge_mode)
+
+    outcomes = await asyncio.gather(
+        *(_analyze_url(url, requested_metrics, validated_edge_mode) for url in request.urls),
+        return_exceptions=True,
+    )
+
+    return {"results": _batch_results(outcomes), "processing_time_ms": _elapsed_ms(start_ns)}
+
+
+def _batch_results(outcomes: list[dict[str, Any] | BaseException]) -> list[dict[str, Any]]:
+    """
+    Turn per-image outcomes of a batch into response entries.
+
+    An ``HTTPException`` becomes ``{"status_code", "detail"}`` so one bad
+    image does not fail the whole batch; any other exception is re-raised.
+    """
+    results: list[dict[str, Any]] = []
+    for outcome in outcomes:
+        if isinstance(outcome, HTTPException):
+            results.append({"status_code": outcome.status_code, "detail": outcome.detail})
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results.append(outcome)
+    return results
@@ -33,7 +33,7 @@ class BrightnessAnalysisResponse(BaseModel):
         json_schema_extra = {
             "example": {
                 "brightness_score": 57,
-                "average_luminance": 146.28,
+                "average_luminance": 146.27,
                 "width": 536,
                 "height": 354,
                 "algorithm": "rec709",
@@ -45,14 +45,16 @@ class BrightnessAnalysisResponse(BaseModel):
 class MedianAnalysisResponse(BrightnessAnalysisResponse):
     """Response including median luminance."""
 
-    median_luminance: float = Field(..., ge=0, le=255, description="Median luminance value (0-255)")
+    median_luminance: float = Field(
+        ..., ge=0, le=255, description="Median luminance value (0-255), in steps of 0.5"
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
                 "brightness_score": 57,
-                "average_luminance": 146.28,
-                "median_luminance": 165.88,
+                "average_luminance": 146.27,
+                "median_luminance": 166.0,
                 "width": 536,
                 "height": 354,
                 "algorithm": "rec709",
@@ -72,19 +74,19 @@ class HistogramAnalysisResponse(MedianAnalysisResponse):
         json_schema_extra = {
             "example": {
                 "brightness_score": 57,
-                "average_luminance": 146.28,
-                "median_luminance": 165.88,
+                "average_luminance": 146.27,
+                "median_luminance": 166.0,
                 "histogram": [
                     {"range": "0-24", "percent": 0.2},
-                    {"range": "25-50", "percent": 13.1},
-                    {"range": "51-75", "percent": 15.6},
+                    {"range": "25-50", "percent": 10.4},
+                    {"range": "51-75", "percent": 16.3},
                     {"range": "76-101", "percent": 3.0},
-                    {"range": "102-127", "percent": 3.3},
-                    {"range": "128-152", "percent": 11.5},
-                    {"range": "153-178", "percent": 11.9},
-                    {"range": "179-203", "percent": 24.8},
-                    {"range": "204-229", "percent": 15.5},
-                    {"range": "230-255", "percent": 4.5},
+                    {"range": "102-127", "percent": 3.2},
+                    {"range": "128-152", "percent": 11.3},
+                    {"range": "153-178", "percent": 11.6},
+                    {"range": "179-203", "percent": 23.9},
+                    {"range": "204-229", "percent": 15.6},
+                    {"range": "230-255", "percent": 4.7},
                 ],
                 "width": 536,
                 "height": 354,
@@ -109,9 +111,9 @@ class EdgeAnalysisResponse(BrightnessAnalysisResponse):
         json_schema_extra = {
             "example": {
                 "brightness_score": 57,
-                "average_luminance": 146.28,
+                "average_luminance": 146.27,
                 "edge_brightness_score": 51,
-                "edge_average_luminance": 130.18,
+                "edge_average_luminance": 130.17,
                 "edge_mode": "all",
                 "width": 536,
                 "height": 354,
@@ -128,22 +130,22 @@ class FullAnalysisResponse(HistogramAnalysisResponse, EdgeAnalysisResponse):
         json_schema_extra = {
             "example": {
                 "brightness_score": 57,
-                "average_luminance": 146.28,
-                "median_luminance": 165.88,
+                "average_luminance": 146.27,
+                "median_luminance": 166.0,
                 "histogram": [
                     {"range": "0-24", "percent": 0.2},
-                    {"range": "25-50", "percent": 13.1},
-                    {"range": "51-75", "percent": 15.6},
+                    {"range": "25-50", "percent": 10.4},
+                    {"range": "51-75", "percent": 16.3},
                     {"range": "76-101", "percent": 3.0},
-                    {"range": "102-127", "percent": 3.3},
-                    {"range": "128-152", "percent": 11.5},
-                    {"range": "153-178", "percent": 11.9},
-                    {"range": "179-203", "percent": 24.8},
-                    {"range": "204-229", "percent": 15.5},
-                    {"range": "230-255", "percent": 4.5},
+                    {"range": "102-127", "percent": 3.2},
+                    {"range": "128-152", "percent": 11.3},
+                    {"range": "153-178", "percent": 11.6},
+                    {"range": "179-203", "percent": 23.9},
+                    {"range": "204-229", "percent": 15.6},
+                    {"range": "230-255", "percent": 4.7},
                 ],
                 "edge_brightness_score": 51,
-                "edge_average_luminance": 130.18,
+                "edge_average_luminance": 130.17,
                 "edge_mode": "all",
                 "width": 536,
                 "height": 354,
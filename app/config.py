@@ -9,6 +9,23 @@ def _get_logging_config() -> bool:
     return os.getenv("ENABLE_DETAILED_LOGGING", "true").lower() == "true"
 
 
+def _get_fast_stats_config() -> bool:
+    """Get sampled-statistics configuration from environment variable."""
+    return os.getenv("FAST_STATS", "false").lower() == "true"
+
+
+def _get_prewarm_hosts_config() -> tuple[str, ...]:
+    """Get hosts to pre-connect to at startup from a comma-separated environment variable."""
+    hosts = os.getenv("PREWARM_HOSTS", "")
+    return tuple(host.strip() for host in hosts.split(",") if host.strip())
+
+
+def _get_cors_origins_config() -> tuple[str, ...]:
+    """Get allowed CORS origins from a comma-separated environment variable."""
+    origins = os.getenv("CORS_ALLOW_ORIGINS", "*")
+    return tuple(origin.strip() for origin in origins.split(",") if origin.strip())
+
+
 @dataclass(frozen=True)
 class Settings:
     """Application settings with production-safe defaults."""
@@ -20,6 +37,10 @@ class Settings:
 
     # Processing
     REQUEST_TIMEOUT: float = 2.0  # seconds
+    MAX_DOWNLOADS_PER_HOST: int = 8  # Concurrent URL downloads from one host
+    MAX_BATCH_SIZE: int = 10  # Maximum number of images in one batch request
+    # Image hosts connected to at startup
+    PREWARM_HOSTS: tuple[str, ...] = _get_prewarm_hosts_config()
 
     # Luminance algorithm
     LUMINANCE_ALGORITHM: str = "rec709"
@@ -33,11 +54,20 @@ class Settings:
     HISTOGRAM_BUCKETS: int = 10
     LUMINANCE_MAX: int = 255
 
+    # Sampled statistics: analyze every Nth row and column instead of every pixel.
+    # Applies to every metric (brightness, median, histogram and edge averages),
+    # which all become approximate when enabled.
+    FAST_STATS: bool = _get_fast_stats_config()
+    FAST_STATS_STRIDE: int = 2
+
     # Cache settings
     CACHE_ENABLED: bool = True
     CACHE_MAX_SIZE: int = 512  # Maximum number of cached results (LRU eviction)
     CACHE_TTL_SECONDS: int = 86400  # Time-to-live for cache entries (24 hours)
 
+    # CORS: "*" allows any origin, without credentials
+    CORS_ALLOW_ORIGINS: tuple[str, ...] = _get_cors_origins_config()
+
     # Logging
     ENABLE_DETAILED_LOGGING: bool = _get_logging_config()
 
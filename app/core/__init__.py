@@ -1,31 +1,57 @@
 """Core module exports."""
 
-from app.core.cache import ImageAnalysisCache, compute_cache_key
-from app.core.histogram import calculate_histogram
+from app.core.cache import (
+    ImageAnalysisCache,
+    compute_cache_key,
+    compute_content_key,
+    new_content_hasher,
+)
+from app.core.histogram import calculate_histogram, calculate_histogram_from_counts
 from app.core.luminance import (
+    EDGE_MODES,
     calculate_average_luminance,
+    calculate_average_luminance_from_counts,
     calculate_brightness_score,
     calculate_edge_luminance,
+    calculate_edge_luminance_sum,
     calculate_luminance,
+    calculate_luminance_counts,
     calculate_median_luminance,
+    calculate_median_luminance_from_counts,
+)
+from app.core.resize import request_scaled_decode, resize_image_if_needed
+from app.core.url_handler import (
+    close_http_client,
+    open_http_client,
+    redact_url_for_logging,
+    validate_and_download_from_url,
 )
-from app.core.resize import resize_image_if_needed
-from app.core.url_handler import redact_url_for_logging, validate_and_download_from_url
 from app.core.validators import validate_edge_mode, validate_image_upload, validate_metrics
 
 __all__ = [
+    "EDGE_MODES",
     "ImageAnalysisCache",
     "compute_cache_key",
+    "compute_content_key",
+    "new_content_hasher",
     "calculate_histogram",
+    "calculate_histogram_from_counts",
     "calculate_luminance",
+    "calculate_luminance_counts",
     "calculate_average_luminance",
+    "calculate_average_luminance_from_counts",
     "calculate_median_luminance",
+    "calculate_median_luminance_from_counts",
     "calculate_brightness_score",
     "calculate_edge_luminance",
+    "calculate_edge_luminance_sum",
+    "request_scaled_decode",
     "resize_image_if_needed",
     "validate_image_upload",
     "validate_metrics",
     "validate_edge_mode",
     "validate_and_download_from_url",
     "redact_url_for_logging",
+    "open_http_client",
+    "close_http_client",
 ]
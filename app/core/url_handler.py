@@ -1,13 +1,161 @@
 """URL handling utilities for downloading images from URLs."""
 
+import asyncio
+import hashlib
 import ipaddress
-from urllib.parse import urlparse
-
+import logging
+import socket
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import httpcore
 import httpx
 from fastapi import HTTPException
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Hostnames that always refer to the local machine
+_LOCALHOST_NAMES = frozenset(
+    {"localhost", "localhost.localdomain", "ip6-localhost", "ip6-loopback"}
+)
+
+# Seconds a hostname's checked addresses are reused before resolving it again
+_DNS_CACHE_TTL = 300.0
+
+# Most hostnames a download backend keeps checked addresses for; the oldest goes first
+_DNS_CACHE_MAX_SIZE = 1024
+
+# Accepted media types, without parameters such as charset
+_ALLOWED_MEDIA_TYPES = frozenset(
+    allowed_type.split(";", 1)[0].strip().lower() for allowed_type in settings.ALLOWED_CONTENT_TYPES
+)
+
+# Error message for downloads over the size limit
+_FILE_TOO_LARGE_ERROR = (
+    f"Image from URL exceeds maximum allowed size ({settings.MAX_FILE_SIZE / (1024 * 1024):.0f}MB)"
+)
+
+# Download slots per hostname: the semaphore and how many downloads hold or await it
+_host_slots: dict[str, tuple[asyncio.Semaphore, list[int]]] = {}
+
+# Connection pool bounds for download clients
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Client shared by all downloads while the application runs (see open_http_client)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _new_http_client(timeout: float) -> httpx.AsyncClient:
+    """
+    Create a download client that follows redirects and never stores cookies.
+
+    HTTP/2 is offered to image hosts, so concurrent downloads from one origin
+    are multiplexed over a single connection instead of opening one each;
+    hosts that only speak HTTP/1.1 are unaffected.
+    """
+    # Cookies set by one image host must never be sent along with another user's download
+    no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=True,
+        cookies=no_cookies,
+        transport=_PublicAddressTransport(),
+    )
+
+
+async def open_http_client() -> None:
+    """
+    Open the shared download client.
+
+    Reusing one client keeps connections to image hosts alive across
+    requests, so repeat downloads from a host skip the TCP and TLS
+    handshakes. Hosts listed in ``PREWARM_HOSTS`` are connected to right
+    away. Call on application startup; until then each download uses its
+    own short-lived client.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = _new_http_client(settings.REQUEST_TIMEOUT)
+        if settings.PREWARM_HOSTS:
+            await asyncio.gather(
+                *(_prewarm_host(_http_client, host) for host in settings.PREWARM_HOSTS)
+            )
+
+
+async def _prewarm_host(client: httpx.AsyncClient, hostname: str) -> None:
+    """
+    Connect to an image host ahead of its first download.
+
+    Caches the host's checked addresses and leaves a pooled connection with
+    a finished TLS handshake, so the first download from the host skips the
+    lookup and both handshakes. Best effort: a host that cannot be reached,
+    or that resolves to a private address, is simply skipped.
+    """
+    try:
+        await client.head(f"https://{hostname}/")
+    except (httpx.HTTPError, _BlockedAddressError):
+        logger.warning("Could not pre-connect to image host %s", hostname)
+
+
+async def close_http_client() -> None:
+    """Close the shared download client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+
+@asynccontextmanager
+async def _host_download_slot(hostname: str) -> AsyncIterator[None]:
+    """
+    Limit concurrent downloads from one host to ``MAX_DOWNLOADS_PER_HOST``.
+
+    Extra downloads wait for a slot instead of opening more connections to
+    the same origin. A host's semaphore is dropped once no download holds or
+    awaits it, so the table only ever covers hosts currently in use.
+    """
+    slot = _host_slots.get(hostname)
+    if slot is None:
+        slot = _host_slots[hostname] = (asyncio.Semaphore(settings.MAX_DOWNLOADS_PER_HOST), [0])
+    semaphore, users = slot
+    users[0] += 1
+    try:
+        async with semaphore:
+            yield
+    finally:
+        users[0] -= 1
+        if users[0] == 0:
+            del _host_slots[hostname]
+
+
+def _file_too_large(size: int) -> HTTPException:
+    """Build the 413 error for a download of ``size`` bytes."""
+    return HTTPException(
+        status_code=413,
+        detail={
+            "error": _FILE_TOO_LARGE_ERROR,
+            "max_size_bytes": settings.MAX_FILE_SIZE,
+            "received_size_bytes": size,
+        },
+    )
+
+
+def _private_url_error() -> HTTPException:
+    """Build the 400 error for a URL pointing into the private network."""
+    return HTTPException(
+        status_code=400,
+        detail={
+            "error": "Invalid URL",
+            "detail": "URLs pointing to private or local network addresses are not allowed",
+        },
+    )
+
 
 def redact_url_for_logging(url: str) -> str:
     """
@@ -23,7 +171,7 @@ def redact_url_for_logging(url: str) -> str:
         Redacted URL with only scheme and hostname (e.g. ``https://example.com``)
     """
     try:
-        parsed = urlparse(url)
+        parsed = urlsplit(url)
         # Use parsed.hostname (strips userinfo) and parsed.port for a clean netloc
         host = parsed.hostname or ""
         port = f":{parsed.port}" if parsed.port else ""
@@ -44,36 +192,260 @@ def _is_private_or_local_url(url: str) -> bool:
         True if URL is private/local, False otherwise
     """
     try:
-        parsed = urlparse(url)
-        hostname = parsed.hostname
+        hostname = urlsplit(url).hostname
+    except Exception:
+        return True
+
+    if not hostname:
+        return True
+
+    return _is_private_or_local_host(hostname)
+
+
+@lru_cache(maxsize=1024)
+def _is_private_or_local_host(hostname: str) -> bool:
+    """
+    Check if a hostname is localhost or a private/local IP literal.
+
+    Memoized per hostname, since repeat downloads mostly come from the same
+    few hosts; the result depends on nothing but the hostname.
+    """
+    # Check for localhost names; loopback IP literals are caught by the IP check below
+    if hostname.lower().rstrip(".") in _LOCALHOST_NAMES:
+        return True
+
+    # Try to parse as IP address
+    try:
+        return _is_private_address(hostname)
+    except ValueError:
+        # Not an IP address, it's a hostname - checked after resolving
+        # (see _PublicAddressBackend)
+        return False
+
+
+def _is_private_address(address: str) -> bool:
+    """
+    Check if an IP address is private, loopback, link-local or multicast.
+
+    Raises:
+        ValueError: If address is not an IP address
+    """
+    ip = ipaddress.ip_address(address)
+    return ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_multicast
+
+
+async def _resolve_host(hostname: str) -> tuple[str, ...]:
+    """
+    Resolve a hostname to its IP addresses.
+
+    Resolution runs in the event loop's default executor and does not block
+    other requests.
+
+    Raises:
+        OSError: If the hostname cannot be resolved
+    """
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+    return tuple(dict.fromkeys(str(info[4][0]) for info in infos))
+
+
+class _BlockedAddressError(Exception):
+    """Raised when a download host resolves to a private/local address."""
+
+
+class _PublicAddressBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that only connects to public addresses.
+
+    Each hostname is resolved once, every resolved address is checked, and
+    the connection is opened to a checked address itself. A DNS answer that
+    changes between the check and the connection (DNS rebinding) therefore
+    cannot reach the private network. TLS SNI and the Host header still use
+    the hostname, since httpcore passes it separately.
+
+    Checked addresses are reused for ``_DNS_CACHE_TTL`` seconds, so new
+    connections to a recent host skip the lookup. This is safe because the
+    cached addresses are the ones that get dialed. Hosts that resolve to a
+    private address are never cached.
+    """
 
-        if not hostname:
-            return True
+    def __init__(self) -> None:
+        self._backend = httpcore.AnyIOBackend()
+        # Checked addresses per hostname, with the monotonic time they expire at
+        self._addresses: dict[str, tuple[float, tuple[str, ...]]] = {}
 
-        # Check for localhost
-        if hostname.lower() in ("localhost", "127.0.0.1", "::1"):
-            return True
+    async def _public_addresses(self, host: str, timeout: float | None) -> tuple[str, ...]:
+        """
+        Return the checked addresses of ``host``, resolving it when not cached.
+
+        Raises:
+            _BlockedAddressError: If any resolved address is private/local
+        """
+        now = time.monotonic()
+        cached = self._addresses.get(host)
+        if cached is not None and cached[0] > now:
+            return cached[1]
 
-        # Try to parse as IP address
         try:
-            ip = ipaddress.ip_address(hostname)
-            # Check if it's a private IP
-            return ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_multicast
-        except ValueError:
-            # Not an IP address, it's a hostname - allow it
-            # DNS will resolve to IP, and httpx will handle invalid hostnames
-            return False
-    except Exception:
+            addresses = await asyncio.wait_for(_resolve_host(host), timeout)
+        except asyncio.TimeoutError as e:
+            raise httpcore.ConnectTimeout(f"Timed out resolving {host}") from e
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        if not addresses or any(_is_blocked_address(address) for address in addresses):
+            self._addresses.pop(host, None)
+            raise _BlockedAddressError(host)
+
+        self._addresses.pop(host, None)
+        if len(self._addresses) >= _DNS_CACHE_MAX_SIZE:
+            del self._addresses[next(iter(self._addresses))]
+        self._addresses[host] = (now + _DNS_CACHE_TTL, addresses)
+        return addresses
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        addresses = await self._public_addresses(host, timeout)
+
+        error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _is_blocked_address(address: str) -> bool:
+    """Check if a resolved address is private/local or cannot be parsed."""
+    try:
+        return _is_private_address(address)
+    except ValueError:
+        # e.g. scoped IPv6 addresses ("fe80::1%eth0"), which are link-local anyway
         return True
 
 
-async def validate_and_download_from_url(url: str, timeout: float | None = None) -> bytes:
+# httpcore errors and the httpx errors they surface as, most specific first
+_HTTPCORE_ERRORS: dict[type[Exception], type[httpx.RequestError]] = {
+    httpcore.ConnectTimeout: httpx.ConnectTimeout,
+    httpcore.ReadTimeout: httpx.ReadTimeout,
+    httpcore.WriteTimeout: httpx.WriteTimeout,
+    httpcore.PoolTimeout: httpx.PoolTimeout,
+    httpcore.TimeoutException: httpx.TimeoutException,
+    httpcore.ConnectError: httpx.ConnectError,
+    httpcore.ReadError: httpx.ReadError,
+    httpcore.WriteError: httpx.WriteError,
+    httpcore.NetworkError: httpx.NetworkError,
+    httpcore.UnsupportedProtocol: httpx.UnsupportedProtocol,
+    httpcore.LocalProtocolError: httpx.LocalProtocolError,
+    httpcore.RemoteProtocolError: httpx.RemoteProtocolError,
+    httpcore.ProtocolError: httpx.ProtocolError,
+}
+
+
+@contextmanager
+def _map_httpcore_errors() -> Iterator[None]:
+    """Re-raise httpcore errors as their httpx equivalents."""
+    try:
+        yield
+    except Exception as e:
+        for error_type in type(e).__mro__:
+            if error_type in _HTTPCORE_ERRORS:
+                raise _HTTPCORE_ERRORS[error_type](str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """Response body of a :class:`_PublicAddressTransport` request."""
+
+    def __init__(self, stream: AsyncIterable[bytes]) -> None:
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _map_httpcore_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class _PublicAddressTransport(httpx.AsyncBaseTransport):
+    """
+    Download transport whose connections all go through :class:`_PublicAddressBackend`.
+
+    ``httpx.AsyncHTTPTransport`` has no option for the network backend, so
+    the connection pool is built here with only public httpcore and httpx
+    APIs. Every connection the pool opens, redirects included, is checked
+    and pinned.
+    """
+
+    def __init__(self) -> None:
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=_HTTP_LIMITS.max_connections,
+            max_keepalive_connections=_HTTP_LIMITS.max_keepalive_connections,
+            keepalive_expiry=_HTTP_LIMITS.keepalive_expiry,
+            http2=True,
+            network_backend=_PublicAddressBackend(),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _map_httpcore_errors():
+            core_response = await self._pool.handle_async_request(core_request)
+
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=_ResponseStream(core_response.stream),
+            extensions=core_response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+async def validate_and_download_from_url(
+    url: str,
+    timeout: float | None = None,
+    hasher: hashlib.blake2b | None = None,
+) -> bytes:
     """
     Download image from URL with validation and size limits.
 
     Args:
         url: The URL to download the image from
         timeout: Request timeout in seconds (default: uses settings.REQUEST_TIMEOUT)
+        hasher: Optional hasher updated with each chunk as it arrives, so the
+            content can be hashed without a second pass over the bytes
 
     Returns:
         The raw image bytes
@@ -85,11 +457,10 @@ async def validate_and_download_from_url(url: str, timeout: float | None = None)
     if timeout is None:
         timeout = settings.REQUEST_TIMEOUT
 
-    # Basic URL validation
-    if not url or not url.strip():
-        raise HTTPException(status_code=400, detail={"error": "URL cannot be empty"})
-
+    # Basic URL validation (strip() returns the URL itself when there is nothing to strip)
     url = url.strip()
+    if not url:
+        raise HTTPException(status_code=400, detail={"error": "URL cannot be empty"})
 
     # Check URL scheme
     if not url.startswith(("http://", "https://")):
@@ -103,26 +474,30 @@ async def validate_and_download_from_url(url: str, timeout: float | None = None)
 
     # Check for private/local URLs to prevent SSRF
     if _is_private_or_local_url(url):
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "Invalid URL",
-                "detail": "URLs pointing to private or local network addresses are not allowed",
-            },
-        )
+        raise _private_url_error()
 
     # SECURITY NOTE: User-provided URL is used here, which is the intended functionality
     # of this endpoint. SSRF mitigation is implemented via:
     # 1. URL scheme validation (http/https only)
-    # 2. Private/local IP blocking (see _is_private_or_local_url)
-    # 3. Timeout protection (uses settings.REQUEST_TIMEOUT)
+    # 2. Private/local IP blocking (see _is_private_or_local_url), including
+    #    hostnames that resolve to private addresses (see _PublicAddressBackend)
+    # 3. Timeout protection (uses settings.REQUEST_TIMEOUT) and a per-host
+    #    concurrency limit (uses settings.MAX_DOWNLOADS_PER_HOST)
     # 4. Size limits (5MB max, enforced via streaming below)
     # 5. Content-type validation (JPEG/PNG only)
     try:
-        async with (
-            httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client,
-            client.stream("GET", url) as response,
-        ):
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(_host_download_slot(urlsplit(url).hostname or ""))
+            client = _http_client
+            if client is None:
+                client = await stack.enter_async_context(_new_http_client(timeout))
+            # send(stream=True) rather than the client.stream() context manager:
+            # the exit stack already closes the response, so no wrapper is needed
+            request = client.build_request("GET", url, timeout=timeout)
+            response = await client.send(request, stream=True)
+            stack.push_async_callback(response.aclose)
+            logger.debug("Image download response received over %s", response.http_version)
+
             # Check if request was successful
             if response.status_code != 200:
                 raise HTTPException(
@@ -139,13 +514,7 @@ async def validate_and_download_from_url(url: str, timeout: float | None = None)
             # Extract media type (before semicolon for charset params)
             media_type = content_type.split(";", 1)[0].strip()
 
-            # Normalize allowed types
-            allowed_media_types = {
-                allowed_type.split(";", 1)[0].strip().lower()
-                for allowed_type in settings.ALLOWED_CONTENT_TYPES
-            }
-
-            if media_type not in allowed_media_types:
+            if media_type not in _ALLOWED_MEDIA_TYPES:
                 raise HTTPException(
                     status_code=415,
                     detail={
@@ -155,47 +524,37 @@ async def validate_and_download_from_url(url: str, timeout: float | None = None)
                     },
                 )
 
-            # Pre-check Content-Length header if present
-            content_length_header = response.headers.get("content-length")
-            if content_length_header is not None:
-                try:
-                    content_length = int(content_length_header)
-                    if content_length > settings.MAX_FILE_SIZE:
-                        max_mb = settings.MAX_FILE_SIZE / (1024 * 1024)
-                        raise HTTPException(
-                            status_code=413,
-                            detail={
-                                "error": f"Image from URL exceeds maximum allowed size ({max_mb:.0f}MB)",
-                                "max_size_bytes": settings.MAX_FILE_SIZE,
-                                "received_size_bytes": content_length,
-                            },
-                        )
-                except ValueError:
-                    # Invalid Content-Length header, will check during streaming
-                    pass
-
-            # Stream content and enforce size limit while downloading
-            contents = bytearray()
+            # Pre-check Content-Length header if present. An invalid header is
+            # skipped here; the size limit is still enforced during streaming.
+            # isdecimal() (unlike isdigit()) only accepts what int() can parse.
+            content_length_header = response.headers.get("content-length", "")
+            if content_length_header.isdecimal():
+                content_length = int(content_length_header)
+                if content_length > settings.MAX_FILE_SIZE:
+                    raise _file_too_large(content_length)
+
+            # Stream content and enforce size limit while downloading. Chunks are
+            # kept as received and joined once at the end: a single exact-size
+            # allocation and a single copy of the body, with no intermediate buffer.
+            chunks = []
+            received = 0
             async for chunk in response.aiter_bytes(chunk_size=65536):
-                contents.extend(chunk)
-                if len(contents) > settings.MAX_FILE_SIZE:
-                    max_mb = settings.MAX_FILE_SIZE / (1024 * 1024)
-                    raise HTTPException(
-                        status_code=413,
-                        detail={
-                            "error": f"Image from URL exceeds maximum allowed size ({max_mb:.0f}MB)",
-                            "max_size_bytes": settings.MAX_FILE_SIZE,
-                            "received_size_bytes": len(contents),
-                        },
-                    )
-
-            if len(contents) == 0:
+                received += len(chunk)
+                if received > settings.MAX_FILE_SIZE:
+                    raise _file_too_large(received)
+                chunks.append(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+
+            if received == 0:
                 raise HTTPException(
                     status_code=400, detail={"error": "Downloaded image file is empty"}
                 )
 
-            return bytes(contents)
+            return b"".join(chunks)
 
+    except _BlockedAddressError as e:
+        raise _private_url_error() from e
     except httpx.TimeoutException as e:
         raise HTTPException(
             status_code=408,
@@ -1,14 +1,40 @@
 """Input validation utilities for image processing."""
 
+from functools import lru_cache
+
 from fastapi import HTTPException, UploadFile
 
 from app.config import settings
+from app.core.luminance import EDGE_MODES
+
+# Metrics that can be requested
+_VALID_METRICS = frozenset({"brightness", "median", "histogram"})
+
+# Metrics returned when none are requested
+_DEFAULT_METRICS = frozenset({"brightness"})
+
+# Edge modes that can be requested
+_VALID_EDGE_MODES = frozenset(EDGE_MODES)
+
+# Error message for uploads over the size limit
+_FILE_TOO_LARGE_ERROR = (
+    f"Image exceeds maximum allowed size ({settings.MAX_FILE_SIZE / (1024 * 1024):.0f}MB)"
+)
+
+# Leading bytes of the accepted formats (JPEG SOI marker, PNG signature)
+_IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
 
 
 async def validate_image_upload(image: UploadFile) -> bytes:
     """
     Validate uploaded image file.
 
+    Cheap checks run before anything proportional to the file size. The
+    multipart body has already been received and spooled by Starlette, but
+    the declared size is checked before it is copied into memory, that copy
+    is capped just past the size limit, and the leading magic bytes are
+    checked before the content is hashed or decoded.
+
     Args:
         image: The uploaded file
 
@@ -29,68 +55,93 @@ async def validate_image_upload(image: UploadFile) -> bytes:
             },
         )
 
-    # Read content
-    contents = await image.read()
+    # Check the declared size first, so oversized uploads are rejected before
+    # the body is copied into memory
+    if image.size is not None:
+        _check_upload_size(image.size)
+
+    # Read at most one byte past the limit, so an upload without a declared
+    # size never puts more than MAX_FILE_SIZE + 1 bytes into memory
+    contents = await image.read(settings.MAX_FILE_SIZE + 1)
 
     # Check file size
-    if len(contents) > settings.MAX_FILE_SIZE:
-        max_mb = settings.MAX_FILE_SIZE / (1024 * 1024)
+    _check_upload_size(len(contents))
+
+    if len(contents) == 0:
+        raise HTTPException(status_code=400, detail={"error": "Empty image file"})
+
+    # Check magic bytes so non-image content is rejected without being hashed
+    if not contents.startswith(_IMAGE_SIGNATURES):
         raise HTTPException(
-            status_code=413,
+            status_code=400,
             detail={
-                "error": f"Image exceeds maximum allowed size ({max_mb:.0f}MB)",
-                "max_size_bytes": settings.MAX_FILE_SIZE,
-                "received_size_bytes": len(contents),
+                "error": "Invalid or corrupted image file",
+                "details": "File content is not a JPEG or PNG image",
             },
         )
 
-    if len(contents) == 0:
-        raise HTTPException(status_code=400, detail={"error": "Empty image file"})
-
     return contents
 
 
-def validate_metrics(metrics: str | None) -> set[str]:
+def _check_upload_size(size: int) -> None:
+    """Raise 413 if an upload of ``size`` bytes exceeds the maximum file size."""
+    if size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "error": _FILE_TOO_LARGE_ERROR,
+                "max_size_bytes": settings.MAX_FILE_SIZE,
+                "received_size_bytes": size,
+            },
+        )
+
+
+@lru_cache(maxsize=64)
+def validate_metrics(metrics: str | None) -> frozenset[str]:
     """
     Validate and parse metrics query parameter.
 
+    Results are memoized per raw query string, since clients reuse a handful
+    of metric combinations; invalid input raises and is never cached.
+
     Args:
         metrics: Comma-separated metrics string
 
     Returns:
-        Set of validated metric names
+        Immutable set of validated metric names
 
     Raises:
         HTTPException: If invalid metrics requested
     """
-    valid_metrics = {"brightness", "median", "histogram"}
-
     if metrics is None:
-        return {"brightness"}  # Default metric
+        return _DEFAULT_METRICS
 
-    requested = {m.strip().lower() for m in metrics.split(",") if m.strip()}
+    requested = frozenset(m.strip().lower() for m in metrics.split(",") if m.strip())
 
-    invalid = requested - valid_metrics
+    invalid = requested - _VALID_METRICS
     if invalid:
         raise HTTPException(
             status_code=400,
             detail={
                 "error": "Invalid metrics requested",
                 "invalid_metrics": list(invalid),
-                "valid_metrics": list(valid_metrics),
+                "valid_metrics": list(_VALID_METRICS),
             },
         )
 
     if not requested:
-        return {"brightness"}
+        return _DEFAULT_METRICS
 
     return requested
 
 
+@lru_cache(maxsize=64)
 def validate_edge_mode(edge_mode: str | None) -> str | None:
     """
     Validate edge mode parameter.
 
+    Results are memoized per raw query string, like :func:`validate_metrics`.
+
     Args:
         edge_mode: Edge mode string
 
@@ -100,20 +151,18 @@ def validate_edge_mode(edge_mode: str | None) -> str | None:
     Raises:
         HTTPException: If invalid edge mode requested
     """
-    valid_modes = {"left_right", "top_bottom", "all"}
-
     if edge_mode is None:
         return None
 
     mode = edge_mode.strip().lower()
 
-    if mode not in valid_modes:
+    if mode not in _VALID_EDGE_MODES:
         raise HTTPException(
             status_code=400,
             detail={
                 "error": "Invalid edge_mode requested",
                 "received": edge_mode,
-                "valid_modes": list(valid_modes),
+                "valid_modes": list(EDGE_MODES),
             },
         )
 
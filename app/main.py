@@ -20,7 +20,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.__version__ import __version__
-from app.api import image_analysis_router
+from app.api import image_analysis_router, warm_up_analysis
+from app.config import settings
+from app.core import close_http_client, open_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +35,9 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# Response body for unexpected errors when exception details are not exposed
+_INTERNAL_ERROR_BODY = {"error": "Internal server error"}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -40,15 +45,19 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("=" * 80)
     logger.info("🚀 Image Insights API Starting")
-    logger.info(f"   Version: {__version__}")
-    logger.info(f"   Title: {app.title}")
+    logger.info("   Version: %s", __version__)
+    logger.info("   Title: %s", app.title)
     logger.info("   Docs: http://localhost:8080/docs")
     logger.info("   Health: http://localhost:8080/health")
     logger.info("   Algorithm: Rec. 709 (ITU-R BT.709) luminance")
     logger.info("=" * 80)
+    # Pay one-time decoder and kernel setup before the first request arrives
+    await warm_up_analysis()
+    await open_http_client()
     yield
     # Shutdown
     logger.info("🛑 Image Insights API Shutting Down")
+    await close_http_client()
 
 
 app = FastAPI(
@@ -104,22 +113,33 @@ Brightness scores range from 0 (black) to 100 (white).
     openapi_url="/openapi.json",
 )
 
-# Add CORS middleware
+# Add CORS middleware. Explicit methods and headers let preflight requests be
+# answered from precomputed headers; credentials are only allowed for pinned
+# origins, since a wildcard origin must not be combined with them.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=list(settings.CORS_ALLOW_ORIGINS),
+    allow_credentials="*" not in settings.CORS_ALLOW_ORIGINS,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "x-api-key"],
 )
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    """Handle unexpected exceptions."""
-    return JSONResponse(
-        status_code=500, content={"error": "Internal server error", "details": str(exc)}
-    )
+    """
+    Handle unexpected exceptions.
+
+    The exception is logged server-side. Its message is only echoed to the
+    client when debug logging is enabled, so production 500s neither format
+    nor leak exception text.
+    """
+    logger.exception("Unhandled error while processing request")
+    if logger.isEnabledFor(logging.DEBUG):
+        content = {"error": "Internal server error", "details": str(exc)}
+    else:
+        content = _INTERNAL_ERROR_BODY
+    return JSONResponse(status_code=500, content=content)
 
 
 # Include routers
@@ -16,17 +16,36 @@ Usage:
     # Specify number of iterations
     python scripts/benchmark.py --iterations 10
 
+    # Keep up to 4 requests in flight (throughput rather than latency)
+    python scripts/benchmark.py --concurrency 4
+
+    # Also send 10 images per request to the batch endpoint (time reported per image)
+    python scripts/benchmark.py --batch-size 10
+
     # Save results to file
     python scripts/benchmark.py --output docs/BENCHMARK.md
+
+    # Also keep raw measurements, appended as each benchmark completes
+    python scripts/benchmark.py --jsonl benchmark-runs.jsonl
 """
 
+from __future__ import annotations
+
 import argparse
+import asyncio
+import json
+import os
 import statistics
 import sys
 import time
+from functools import cached_property
+from itertools import count, groupby
+from operator import attrgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
 
-import httpx
+if TYPE_CHECKING:
+    import httpx
 
 # Sample images to benchmark
 SAMPLE_IMAGES = [
@@ -66,46 +85,87 @@ METRICS_COMBINATIONS = [
 ]
 
 
+# Most images the API accepts per batch request (its default MAX_BATCH_SIZE)
+MAX_BATCH_SIZE = 10
+
+# Metrics used for the batched-upload benchmark (see --batch-size)
+BATCH_PARAMS = {"metrics": "brightness,median,histogram"}
+
+
+class BenchmarkRun(NamedTuple):
+    """One image and metrics combination to benchmark."""
+
+    image_key: str
+    metrics_key: str
+    image_path: Path
+    params: dict[str, str]
+    batch_size: int = 1  # Copies per request; above 1 the batch endpoint is used
+
+
 class BenchmarkResult:
     """Container for benchmark results."""
 
-    def __init__(self, name: str):
-        self.name = name
+    def __init__(self, image_key: str, metrics_key: str):
+        self.image_key = image_key
+        self.metrics_key = metrics_key
         self.times: list[float] = []
         self.errors: list[str] = []
 
     def add_time(self, time_ms: float) -> None:
         """Add a timing measurement."""
         self.times.append(time_ms)
+        # A new measurement invalidates the cached summary
+        self.__dict__.pop("summary", None)
 
     def add_error(self, error: str) -> None:
         """Add an error message."""
         self.errors.append(error)
 
+    @cached_property
+    def summary(self) -> dict[str, float]:
+        """
+        Compute all timing statistics in one go.
+
+        The times are sorted once for min, max and median, and the mean is
+        reused for the standard deviation. The result is cached until the
+        next :meth:`add_time`, so reporting reads each statistic for free.
+        """
+        if not self.times:
+            return dict.fromkeys(("avg", "median", "min", "max", "std_dev"), 0.0)
+        times = sorted(self.times)
+        avg = statistics.fmean(times)
+        return {
+            "avg": avg,
+            "median": statistics.median(times),
+            "min": times[0],
+            "max": times[-1],
+            "std_dev": statistics.stdev(times, avg) if len(times) > 1 else 0.0,
+        }
+
     @property
     def avg_time(self) -> float:
         """Get average time."""
-        return statistics.mean(self.times) if self.times else 0.0
+        return self.summary["avg"]
 
     @property
     def median_time(self) -> float:
         """Get median time."""
-        return statistics.median(self.times) if self.times else 0.0
+        return self.summary["median"]
 
     @property
     def min_time(self) -> float:
         """Get minimum time."""
-        return min(self.times) if self.times else 0.0
+        return self.summary["min"]
 
     @property
     def max_time(self) -> float:
         """Get maximum time."""
-        return max(self.times) if self.times else 0.0
+        return self.summary["max"]
 
     @property
     def std_dev(self) -> float:
         """Get standard deviation."""
-        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+        return self.summary["std_dev"]
 
     @property
     def success_rate(self) -> float:
@@ -113,65 +173,96 @@ class BenchmarkResult:
         total = len(self.times) + len(self.errors)
         return (len(self.times) / total * 100) if total > 0 else 0.0
 
+    def to_json(self) -> str:
+        """Serialize the raw measurements as one JSON line."""
+        return json.dumps(
+            {
+                "image": self.image_key,
+                "metrics": self.metrics_key,
+                "times_ms": self.times,
+                "errors": self.errors,
+            }
+        )
+
 
-def run_benchmark(
-    api_host: str, image_path: Path, params: dict[str, str], iterations: int
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    run: BenchmarkRun,
+    iterations: int,
+    slots: asyncio.Semaphore,
 ) -> BenchmarkResult:
     """
     Run benchmark for a specific image and metrics combination.
 
     Args:
-        api_host: API host URL
-        image_path: Path to image file
-        params: Query parameters (metrics, edge_mode)
+        client: HTTP client bound to the API host, reused across iterations so
+            every request after the first travels over a kept-alive connection
+        run: Image and metrics combination to benchmark
         iterations: Number of iterations to run
+        slots: Semaphore shared by all benchmarks that bounds requests in flight
 
     Returns:
         BenchmarkResult with timing statistics
     """
-    result = BenchmarkResult(f"{image_path.name} - {params}")
+    image_path, params, batch_size = run.image_path, run.params, run.batch_size
+    result = BenchmarkResult(run.image_key, run.metrics_key)
 
-    print(f"  Running {iterations} iterations...", end=" ", flush=True)
+    # Read the image once so iterations measure the request, not disk reads
+    image_bytes = image_path.read_bytes()
+
+    # Every uploaded image, single or batched, gets random bytes appended after
+    # the JPEG end marker. Decoders ignore them, but they change the content
+    # hash, so no image is served from the server's caches (not even from an
+    # earlier run), and single and batch rows both measure uncached analysis.
+    payloads = (image_bytes + os.urandom(16) for _ in count())
 
     for _ in range(iterations):
         try:
-            with open(image_path, "rb") as f:
-                files = {"image": (image_path.name, f, "image/jpeg")}
+            if batch_size > 1:
+                endpoint = "/v1/image/analysis/batch"
+                files = [
+                    ("images", (image_path.name, next(payloads), "image/jpeg"))
+                    for _ in range(batch_size)
+                ]
+            else:
+                endpoint = "/v1/image/analysis"
+                files = [("image", (image_path.name, next(payloads), "image/jpeg"))]
 
+            async with slots:
                 # Measure total time including network
-                start_time = time.time()
+                start_ns = time.perf_counter_ns()
 
-                response = httpx.post(
-                    f"{api_host}/v1/image/analysis",
-                    files=files,
-                    params=params,
-                    timeout=30.0,
-                )
+                response = await client.post(endpoint, files=files, params=params)
 
-                total_time = (time.time() - start_time) * 1000  # Convert to ms
+                total_time = (time.perf_counter_ns() - start_ns) / 1_000_000  # Convert to ms
 
-                if response.status_code == 200:
-                    data = response.json()
-                    # Use server-reported processing time if available
-                    processing_time = data.get("processing_time_ms", total_time)
-                    result.add_time(processing_time)
+            if response.status_code == 200:
+                data = response.json()
+                # Use server-reported processing time if available
+                processing_time = data.get("processing_time_ms", total_time)
+                failed = [item for item in data.get("results", []) if "status_code" in item]
+                if failed:
+                    result.add_error(f"{len(failed)} of {batch_size} images failed: {failed[0]}")
                 else:
-                    result.add_error(f"HTTP {response.status_code}: {response.text}")
+                    result.add_time(processing_time / batch_size)
+            else:
+                result.add_error(f"HTTP {response.status_code}: {response.text}")
 
         except Exception as e:
             result.add_error(str(e))
 
-    print("Done!")
+    print(f"  Done: {run.image_key} - {run.metrics_key}")
     return result
 
 
-def print_results(results: dict[str, dict[str, BenchmarkResult]]) -> None:
+def print_results(results: list[BenchmarkResult]) -> None:
     """Print benchmark results in a formatted table."""
     print("\n" + "=" * 100)
     print("BENCHMARK RESULTS")
     print("=" * 100)
 
-    for image_name, metrics_results in results.items():
+    # Results are in plan order, so each image's results are already adjacent
+    for image_name, metrics_results in groupby(results, key=attrgetter("image_key")):
         print(f"\n{image_name}")
         print("-" * 100)
         print(
@@ -179,7 +270,8 @@ def print_results(results: dict[str, dict[str, BenchmarkResult]]) -> None:
         )
         print("-" * 100)
 
-        for metrics_name, result in metrics_results.items():
+        for result in metrics_results:
+            metrics_name = result.metrics_key
             if result.times:
                 print(
                     f"{metrics_name:<40} "
@@ -197,7 +289,7 @@ def print_results(results: dict[str, dict[str, BenchmarkResult]]) -> None:
 
 
 def generate_markdown_report(
-    results: dict[str, dict[str, BenchmarkResult]],
+    results: list[BenchmarkResult],
     api_host: str,
     iterations: int,
 ) -> str:
@@ -205,7 +297,7 @@ def generate_markdown_report(
     Generate a markdown report of benchmark results.
 
     Args:
-        results: Benchmark results
+        results: Benchmark results, in plan order
         api_host: API host URL
         iterations: Number of iterations
 
@@ -233,25 +325,22 @@ def generate_markdown_report(
         "",
     ]
 
-    for image_info in SAMPLE_IMAGES:
-        image_name = image_info["name"]
-        if image_name not in results:
-            continue
-
-        metrics_results = results[image_name]
+    descriptions = {image_info["name"]: image_info["description"] for image_info in SAMPLE_IMAGES}
 
+    for image_name, metrics_results in groupby(results, key=attrgetter("image_key")):
         report.extend(
             [
                 f"### {image_name}",
                 "",
-                f"**Description**: {image_info['description']}",
+                f"**Description**: {descriptions[image_name]}",
                 "",
                 "| Metrics Configuration | Avg (ms) | Median (ms) | Min (ms) | Max (ms) | Std Dev | Success Rate |",
                 "|----------------------|----------|-------------|----------|----------|---------|--------------|",
             ]
         )
 
-        for metrics_name, result in metrics_results.items():
+        for result in metrics_results:
+            metrics_name = result.metrics_key
             if result.times:
                 report.append(
                     f"| {metrics_name} | "
@@ -376,65 +465,125 @@ def main() -> int:
         default=5,
         help="Number of iterations per test (default: 5)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of requests in flight (default: 1, one at a time)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help=(
+            "Also benchmark sending this many images per request, "
+            f"at most {MAX_BATCH_SIZE} (default: 1, disabled)"
+        ),
+    )
     parser.add_argument(
         "--output",
         type=Path,
         help="Output file for results (default: print to stdout)",
     )
+    parser.add_argument(
+        "--jsonl",
+        type=Path,
+        help="Append raw measurements to this JSONL file as each benchmark completes",
+    )
 
     args = parser.parse_args()
+    if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+        parser.error(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
 
     print("=" * 100)
     print("IMAGE INSIGHTS API BENCHMARK")
     print("=" * 100)
     print(f"API Host: {args.host}")
     print(f"Iterations: {args.iterations}")
+    print(f"Concurrency: {args.concurrency}")
     print(f"Sample Images: {len(SAMPLE_IMAGES)}")
     print(f"Metrics Combinations: {len(METRICS_COMBINATIONS)}")
     print("=" * 100)
 
-    # Check if API is reachable
-    try:
-        response = httpx.get(f"{args.host}/health", timeout=5.0)
-        if response.status_code != 200:
-            print(f"\n❌ ERROR: API health check failed (status {response.status_code})")
-            print("Please ensure the API is running and accessible.")
-            return 1
-        print("✅ API is healthy and reachable\n")
-    except Exception as e:
-        print(f"\n❌ ERROR: Cannot connect to API at {args.host}")
-        print(f"   {e}")
-        print("\nPlease ensure the API is running:")
-        print("   uvicorn app.main:app --host 0.0.0.0 --port 8080")
-        return 1
+    return asyncio.run(_run_all(args))
 
-    # Get repository root
-    repo_root = Path(__file__).parent.parent
 
-    # Run benchmarks
-    results: dict[str, dict[str, BenchmarkResult]] = {}
+async def _run_all(args: argparse.Namespace) -> int:
+    """Check the API is reachable, run every benchmark and report the results."""
+    # Imported only once arguments are parsed, so --help and usage errors stay fast
+    import httpx
 
-    for image_info in SAMPLE_IMAGES:
-        image_path = repo_root / image_info["path"]
+    async with httpx.AsyncClient(
+        base_url=args.host,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=30.0,
+    ) as client:
+        # Check if API is reachable
+        try:
+            response = await client.get("/health", timeout=5.0)
+            if response.status_code != 200:
+                print(f"\n❌ ERROR: API health check failed (status {response.status_code})")
+                print("Please ensure the API is running and accessible.")
+                return 1
+            print("✅ API is healthy and reachable\n")
+        except Exception as e:
+            print(f"\n❌ ERROR: Cannot connect to API at {args.host}")
+            print(f"   {e}")
+            print("\nPlease ensure the API is running:")
+            print("   uvicorn app.main:app --host 0.0.0.0 --port 8080")
+            return 1
 
-        if not image_path.exists():
-            print(f"⚠️  WARNING: Image not found: {image_path}")
-            continue
+        # Get repository root
+        repo_root = Path(__file__).parent.parent
 
-        print(f"\n📊 Benchmarking: {image_info['name']}")
-        print(f"   Path: {image_path}")
+        # Plan every image and metrics combination up front; results keep this order
+        plan: list[BenchmarkRun] = []
+        for image_info in SAMPLE_IMAGES:
+            image_path = repo_root / image_info["path"]
 
-        metrics_results: dict[str, BenchmarkResult] = {}
+            if not image_path.exists():
+                print(f"⚠️  WARNING: Image not found: {image_path}")
+                continue
 
-        for metrics_combo in METRICS_COMBINATIONS:
-            metrics_name = metrics_combo["name"]
-            params = metrics_combo["params"]
+            print(f"📊 Benchmarking: {image_info['name']}")
+            print(f"   Path: {image_path}")
 
-            print(f"\n  {metrics_name}")
-            result = run_benchmark(args.host, image_path, params, args.iterations)
-            metrics_results[metrics_name] = result
+            plan.extend(
+                BenchmarkRun(
+                    image_info["name"], metrics_combo["name"], image_path, metrics_combo["params"]
+                )
+                for metrics_combo in METRICS_COMBINATIONS
+            )
+            if args.batch_size > 1:
+                plan.append(
+                    BenchmarkRun(
+                        image_info["name"],
+                        f"All metrics (batch={args.batch_size})",
+                        image_path,
+                        BATCH_PARAMS,
+                        args.batch_size,
+                    )
+                )
+
+        # The semaphore bounds how many requests are in flight, so
+        # --concurrency 1 measures one at a time
+        slots = asyncio.Semaphore(args.concurrency)
+        jsonl_file = args.jsonl.open("a") if args.jsonl else None
 
-        results[image_info["name"]] = metrics_results
+        async def run_and_record(run: BenchmarkRun) -> BenchmarkResult:
+            result = await run_benchmark(client, run, args.iterations, slots)
+            if jsonl_file is not None:
+                # Written as soon as it completes, so an interrupted run keeps it
+                jsonl_file.write(result.to_json() + "\n")
+                jsonl_file.flush()
+            return result
+
+        print(f"\n  Running {args.iterations} iterations per combination...")
+        try:
+            results = list(await asyncio.gather(*(run_and_record(run) for run in plan)))
+        finally:
+            if jsonl_file is not None:
+                jsonl_file.close()
 
     # Print results
     print_results(results)
@@ -22,7 +22,7 @@ import json
 import sys
 from pathlib import Path
 
-import requests
+import httpx
 
 
 def export_openapi_spec(server_url: str, output_path: Path) -> bool:
@@ -41,25 +41,27 @@ def export_openapi_spec(server_url: str, output_path: Path) -> bool:
     print(f"📡 Fetching OpenAPI spec from {openapi_url}...")
 
     try:
-        response = requests.get(openapi_url, timeout=5)
+        response = httpx.get(openapi_url, timeout=5)
         response.raise_for_status()
-    except requests.ConnectionError:
+    except httpx.ConnectError:
         print(f"❌ Error: Could not connect to {server_url}")
         print("   Make sure the API is running:")
         print("   python -m uvicorn app.main:app --reload")
         return False
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❌ Error fetching OpenAPI spec: {e}")
         return False
 
-    spec = response.json()
+    # Parse once and re-indent: FastAPI serves the spec compact. Encoding to one
+    # string and writing it in a single call avoids json.dump's many small
+    # writes; the spec is plain JSON, so the circular reference check is skipped.
+    spec_text = json.dumps(response.json(), indent=2, check_circular=False)
 
     # Save to file
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        with open(output_path, "w") as f:
-            json.dump(spec, f, indent=2)
+        output_path.write_text(spec_text)
         print(f"✅ OpenAPI spec exported to {output_path}")
         return True
     except OSError as e:
@@ -1,6 +1,7 @@
 """Pytest configuration and fixtures."""
 
 import io
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
@@ -17,17 +18,65 @@ SAMPLE_IMAGES_DIR = Path(__file__).parent
 @pytest.fixture(autouse=True)
 def clear_analysis_cache():
     """Clear the image analysis cache before every test for isolation."""
-    from app.api.image_analysis import _cache
+    from app.api.image_analysis import _cache, _stats_cache
 
     _cache.clear()
+    _stats_cache.clear()
     yield
     _cache.clear()
+    _stats_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_real_dns(monkeypatch):
+    """Resolve every download host to a public documentation address, offline."""
+    from app.core import url_handler
+
+    async def resolve_to_public(hostname):
+        return ("93.184.216.34",)
+
+    monkeypatch.setattr(url_handler, "_resolve_host", resolve_to_public)
 
 
 @pytest.fixture
+def httpx_mock(httpx_mock, monkeypatch):
+    """
+    pytest-httpx mock that also covers the download transport.
+
+    pytest-httpx only patches ``httpx.AsyncHTTPTransport``, so downloads
+    are routed through the same patched handler.
+    """
+    import httpx
+
+    from app.core import url_handler
+
+    monkeypatch.setattr(
+        url_handler._PublicAddressTransport,
+        "handle_async_request",
+        httpx.AsyncHTTPTransport.handle_async_request,
+    )
+    return httpx_mock
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client."""
-    return TestClient(app)
+    """Create a test client shared by the whole session; the app lifespan runs once."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def isolated_http_client(monkeypatch):
+    """
+    Hide the session client's shared download client for one test.
+
+    Tests that run the app lifespan (or open and close the download client
+    themselves) would otherwise close the client the session ``client``
+    fixture opened. The original is restored after the test.
+    """
+    from app.core import url_handler
+
+    monkeypatch.setattr(url_handler, "_http_client", None)
 
 
 @pytest.fixture
@@ -50,15 +99,20 @@ def create_test_image():
         Returns:
             BytesIO buffer with the image
         """
-        img = Image.new("RGB", size, color)
-        buffer = io.BytesIO()
-        img.save(buffer, format=format)
-        buffer.seek(0)
-        return buffer
+        return io.BytesIO(_encode_test_image(color, size, format))
 
     return _create_image
 
 
+@lru_cache(maxsize=32)
+def _encode_test_image(color: tuple[int, int, int], size: tuple[int, int], format: str) -> bytes:
+    """Encode a solid-color test image; each distinct image is encoded once per session."""
+    img = Image.new("RGB", size, color)
+    buffer = io.BytesIO()
+    img.save(buffer, format=format)
+    return buffer.getvalue()
+
+
 @pytest.fixture
 def black_image(create_test_image):
     """Create a pure black image."""
@@ -89,21 +143,33 @@ def jpeg_image(create_test_image):
     return create_test_image(format="JPEG")
 
 
-@pytest.fixture
-def sample_color_image():
-    """Load the sample color image (sample2-536x354.jpg)."""
-    image_path = SAMPLE_IMAGES_DIR / "sample2-536x354.jpg"
+def _read_sample_image(filename: str) -> bytes:
+    """Read a sample image from the tests directory, skipping if it is missing."""
+    image_path = SAMPLE_IMAGES_DIR / filename
     if not image_path.exists():
         pytest.skip(f"Sample image not found: {image_path}")
-    with open(image_path, "rb") as f:
-        return io.BytesIO(f.read())
+    return image_path.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def sample_color_image_bytes():
+    """Bytes of the sample color image, read once per session."""
+    return _read_sample_image("sample2-536x354.jpg")
+
+
+@pytest.fixture(scope="session")
+def sample_grayscale_image_bytes():
+    """Bytes of the sample grayscale image, read once per session."""
+    return _read_sample_image("sample1-536x354-grayscale.jpg")
 
 
 @pytest.fixture
-def sample_grayscale_image():
+def sample_color_image(sample_color_image_bytes):
+    """Load the sample color image (sample2-536x354.jpg)."""
+    return io.BytesIO(sample_color_image_bytes)
+
+
+@pytest.fixture
+def sample_grayscale_image(sample_grayscale_image_bytes):
     """Load the sample grayscale image (sample1-536x354-grayscale.jpg)."""
-    image_path = SAMPLE_IMAGES_DIR / "sample1-536x354-grayscale.jpg"
-    if not image_path.exists():
-        pytest.skip(f"Sample image not found: {image_path}")
-    with open(image_path, "rb") as f:
-        return io.BytesIO(f.read())
+    return io.BytesIO(sample_grayscale_image_bytes)
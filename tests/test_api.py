@@ -1,9 +1,24 @@
 """Tests for the image analysis API endpoint."""
 
+import asyncio
 import io
+import json
+import threading
 
-from app.api.image_analysis import _cache
-from app.core.cache import ImageAnalysisCache, compute_cache_key
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.api import image_analysis
+from app.api.image_analysis import _cache, _stats_cache
+from app.config import settings
+from app.core import url_handler
+from app.core.cache import (
+    ImageAnalysisCache,
+    compute_cache_key,
+    compute_content_key,
+    new_content_hasher,
+)
 
 
 class TestHealthEndpoints:
@@ -24,6 +39,54 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
 
+    def test_startup_warm_up_leaves_caches_empty(self, isolated_http_client):
+        """Startup warm-up runs the pipeline without caching anything."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 200
+
+        assert _cache.size == 0
+        assert _stats_cache.size == 0
+
+    def test_cors_preflight_allows_any_origin_without_credentials(self, client):
+        """Default CORS config allows any origin but never with credentials."""
+        response = client.options(
+            "/v1/image/analysis",
+            headers={
+                "Origin": "https://example.com",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "*"
+        assert "access-control-allow-credentials" not in response.headers
+
+    def test_cors_preflight_allows_api_key_header(self, client):
+        """Browsers may send the documented X-API-Key header across origins."""
+        response = client.options(
+            "/v1/image/analysis",
+            headers={
+                "Origin": "https://example.com",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type,x-api-key",
+            },
+        )
+        assert response.status_code == 200
+        allowed = response.headers["access-control-allow-headers"].lower()
+        assert "x-api-key" in allowed
+
+    def test_unhandled_error_hides_exception_details(self):
+        """Unexpected errors return a static 500 body without the exception text."""
+        from app.main import global_exception_handler
+
+        response = asyncio.run(global_exception_handler(None, RuntimeError("internal detail")))
+        assert response.status_code == 500
+        assert json.loads(response.body) == {"error": "Internal server error"}
+
 
 class TestImageAnalysisEndpoint:
     """Test POST /v1/image/analysis endpoint."""
@@ -49,6 +112,23 @@ class TestImageAnalysisEndpoint:
         assert data["brightness_score"] == 100
         assert data["average_luminance"] == 255.0
 
+    def test_analysis_runs_in_worker_thread(self, client, black_image, monkeypatch):
+        """Image processing should run on the analysis pool, not the event loop thread."""
+        thread_names = []
+        process = image_analysis._process_image_bytes
+
+        def recording_process(*args):
+            thread_names.append(threading.current_thread().name)
+            return process(*args)
+
+        monkeypatch.setattr(image_analysis, "_process_image_bytes", recording_process)
+
+        response = client.post(
+            "/v1/image/analysis", files={"image": ("test.png", black_image, "image/png")}
+        )
+        assert response.status_code == 200
+        assert thread_names and thread_names[0].startswith("analysis")
+
     def test_analyze_gray_image(self, client, gray_image):
         """Test analysis of gray image returns ~50 brightness."""
         response = client.post(
@@ -68,6 +148,18 @@ class TestImageAnalysisEndpoint:
         data = response.json()
         assert "brightness_score" in data
 
+    def test_large_jpeg_reports_original_dimensions(self, client, create_test_image):
+        """Large JPEGs decoded at reduced scale still report their original dimensions."""
+        img = create_test_image(color=(128, 128, 128), size=(4000, 3000), format="JPEG")
+        response = client.post(
+            "/v1/image/analysis", files={"image": ("test.jpg", img, "image/jpeg")}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["width"] == 4000
+        assert data["height"] == 3000
+        assert 49 <= data["brightness_score"] <= 51
+
     def test_response_includes_dimensions(self, client, create_test_image):
         """Test response includes image dimensions."""
         img = create_test_image(size=(200, 150))
@@ -198,6 +290,16 @@ class TestValidation:
         data = response.json()
         assert "error" in data["detail"]
 
+    def test_decompression_bomb_rejected(self, client, create_test_image, monkeypatch):
+        """Images over Pillow's pixel limit are reported as invalid, not as server errors."""
+        monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+        img = create_test_image(size=(100, 100))
+        response = client.post(
+            "/v1/image/analysis", files={"image": ("test.png", img, "image/png")}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "Invalid or corrupted image file"
+
     def test_empty_file(self, client):
         """Test empty file returns 400."""
         empty_file = io.BytesIO(b"")
@@ -206,6 +308,21 @@ class TestValidation:
         )
         assert response.status_code == 400
 
+    def test_non_image_signature_rejected_before_hashing(self, client, monkeypatch):
+        """Content without a JPEG/PNG signature is rejected before the cache key is hashed."""
+        hashed = []
+        monkeypatch.setattr(
+            image_analysis, "compute_cache_key", lambda **kwargs: hashed.append(kwargs)
+        )
+
+        response = client.post(
+            "/v1/image/analysis",
+            files={"image": ("test.png", io.BytesIO(b"GIF89a" + b"\x00" * 100), "image/png")},
+        )
+        assert response.status_code == 400
+        assert "not a JPEG or PNG" in response.json()["detail"]["details"]
+        assert hashed == []
+
 
 class TestDeterminism:
     """Test that results are deterministic."""
@@ -592,6 +709,21 @@ class TestImageAnalysisUrlEndpoint:
         data = response.json()
         assert "error" in data["detail"]
 
+    def test_url_endpoint_content_length_mismatch(self, client, httpx_mock, create_test_image):
+        """Test a Content-Length header that overstates the body is only a size hint."""
+        test_image = self._image_to_bytes(create_test_image((255, 255, 255)))
+        httpx_mock.add_response(
+            url="https://example.com/white.png",
+            content=test_image,
+            headers={"content-type": "image/png", "content-length": str(len(test_image) + 100)},
+        )
+
+        response = client.post(
+            "/v1/image/analysis/url", json={"url": "https://example.com/white.png"}
+        )
+        assert response.status_code == 200
+        assert response.json()["brightness_score"] == 100
+
     def test_url_endpoint_invalid_metrics(self, client):
         """Test URL endpoint with invalid metrics."""
         response = client.post(
@@ -657,7 +789,12 @@ class TestUrlEndpointSSRFProtection:
 
     def test_url_endpoint_blocks_localhost(self, client):
         """Test URL endpoint blocks localhost URLs."""
-        for url in ["http://localhost/image.png", "http://127.0.0.1/image.png"]:
+        for url in [
+            "http://localhost/image.png",
+            "http://127.0.0.1/image.png",
+            "http://[::1]/image.png",
+            "http://ip6-localhost/image.png",
+        ]:
             response = client.post("/v1/image/analysis/url", json={"url": url})
             assert response.status_code == 400
             data = response.json()
@@ -676,6 +813,20 @@ class TestUrlEndpointSSRFProtection:
             data = response.json()
             assert "private or local" in data["detail"]["detail"].lower()
 
+    def test_url_endpoint_blocks_hostnames_resolving_to_private_ips(self, client, monkeypatch):
+        """Test URL endpoint blocks public-looking hostnames that resolve to private IPs."""
+
+        async def resolve_to_private(hostname):
+            return ("93.184.216.34", "10.0.0.5")
+
+        monkeypatch.setattr(url_handler, "_resolve_host", resolve_to_private)
+
+        response = client.post(
+            "/v1/image/analysis/url", json={"url": "https://internal.example.com/image.png"}
+        )
+        assert response.status_code == 400
+        assert "private or local" in response.json()["detail"]["detail"].lower()
+
     def test_url_endpoint_allows_public_domains(self, client, httpx_mock, create_test_image):
         """Test URL endpoint allows public domain URLs."""
         test_image = create_test_image((128, 128, 128)).getvalue()
@@ -691,6 +842,87 @@ class TestUrlEndpointSSRFProtection:
         assert response.status_code == 200
 
 
+class TestImageAnalysisBatchEndpoint:
+    """Test POST /v1/image/analysis/batch endpoint."""
+
+    def test_batch_returns_results_in_upload_order(self, client, create_test_image):
+        """Test each upload gets its own result, with failures reported per item."""
+        response = client.post(
+            "/v1/image/analysis/batch?metrics=brightness",
+            files=[
+                ("images", ("black.png", create_test_image((0, 0, 0)), "image/png")),
+                ("images", ("fake.gif", io.BytesIO(b"GIF89a..."), "image/gif")),
+                ("images", ("white.png", create_test_image((255, 255, 255)), "image/png")),
+            ],
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["brightness_score"] == 0
+        assert results[1]["status_code"] == 415
+        assert results[2]["brightness_score"] == 100
+
+    def test_batch_rejects_too_many_images(self, client, create_test_image):
+        """Test the number of uploads is limited."""
+        image = create_test_image((128, 128, 128)).getvalue()
+        files = [("images", ("gray.png", image, "image/png"))] * (settings.MAX_BATCH_SIZE + 1)
+        response = client.post("/v1/image/analysis/batch", files=files)
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "Too many images"
+
+
+class TestImageAnalysisUrlBatchEndpoint:
+    """Test POST /v1/image/analysis/url/batch endpoint."""
+
+    def test_batch_returns_results_in_request_order(self, client, monkeypatch, create_test_image):
+        """Test each URL gets its own result, in request order."""
+        images = {
+            "https://example.com/black.png": create_test_image((0, 0, 0)).getvalue(),
+            "https://example.com/white.png": create_test_image((255, 255, 255)).getvalue(),
+        }
+
+        async def fake_download(url, timeout=None, hasher=None):
+            if hasher is not None:
+                hasher.update(images[url])
+            return images[url]
+
+        monkeypatch.setattr(image_analysis, "validate_and_download_from_url", fake_download)
+
+        response = client.post(
+            "/v1/image/analysis/url/batch",
+            json={"urls": list(images), "metrics": "brightness,median"},
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["brightness_score"] for result in results] == [0, 100]
+        assert all("median_luminance" in result for result in results)
+
+    def test_batch_reports_failed_urls_per_item(self, client):
+        """Test a failing URL does not fail the rest of the batch."""
+        response = client.post(
+            "/v1/image/analysis/url/batch",
+            json={"urls": ["ftp://example.com/image.png", "http://localhost/image.png"]},
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [400, 400]
+        assert results[0]["detail"]["error"] == "Invalid URL scheme"
+        assert "private or local" in results[1]["detail"]["detail"].lower()
+
+    def test_batch_rejects_empty_and_oversized_url_lists(self, client):
+        """Test the number of URLs is validated."""
+        for urls in ([], ["https://example.com/image.png"] * (settings.MAX_BATCH_SIZE + 1)):
+            response = client.post("/v1/image/analysis/url/batch", json={"urls": urls})
+            assert response.status_code == 422
+
+    def test_batch_validates_metrics_once_for_all_urls(self, client):
+        """Test invalid metrics fail the whole batch."""
+        response = client.post(
+            "/v1/image/analysis/url/batch",
+            json={"urls": ["https://example.com/image.png"], "metrics": "invalid"},
+        )
+        assert response.status_code == 400
+
+
 class TestRealSampleImages:
     """Test analysis with real sample images."""
 
@@ -744,6 +976,25 @@ class TestRealSampleImages:
         assert 55 <= data["brightness_score"] <= 70
         assert 150 <= data["average_luminance"] <= 170
 
+    def test_grayscale_matches_rgb_equivalent(self, client, sample_grayscale_image):
+        """Grayscale images analyzed natively should match their RGB conversion."""
+        gray = Image.open(sample_grayscale_image)
+        results = []
+        for img in (gray, gray.convert("RGB")):
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG")
+            buffer.seek(0)
+            response = client.post(
+                "/v1/image/analysis?metrics=brightness,median,histogram&edge_mode=all",
+                files={"image": ("test.png", buffer, "image/png")},
+            )
+            assert response.status_code == 200
+            data = response.json()
+            data.pop("processing_time_ms")
+            results.append(data)
+
+        assert results[0] == results[1]
+
     def test_sample_images_with_edge_mode(self, client, sample_color_image):
         """Test edge mode analysis with sample image."""
         response = client.post(
@@ -887,6 +1138,28 @@ class TestCachingBehavior:
 
         assert _cache.size == 1
 
+    def test_image_stats_reused_across_metric_combinations(self, client, sample_color_image):
+        """A new metric combination for a known image should reuse its cached statistics."""
+        image_bytes = sample_color_image.getvalue()
+
+        r1 = client.post(
+            "/v1/image/analysis?metrics=brightness",
+            files={"image": ("test.png", io.BytesIO(image_bytes), "image/png")},
+        ).json()
+        assert _stats_cache.size == 1
+
+        r2 = client.post(
+            "/v1/image/analysis?metrics=brightness,median,histogram&edge_mode=all",
+            files={"image": ("test.png", io.BytesIO(image_bytes), "image/png")},
+        ).json()
+        # Response cache misses, but the image is not decoded again
+        assert r2["cached"] is False
+        assert _stats_cache.size == 1
+        assert r2["brightness_score"] == r1["brightness_score"]
+        assert "median_luminance" in r2
+        assert len(r2["histogram"]) == 10
+        assert "edge_brightness_score" in r2
+
     def test_url_endpoint_first_request_not_cached(self, client, httpx_mock, create_test_image):
         """First URL request should have cached=False."""
         image_bytes = create_test_image((128, 128, 128)).getvalue()
@@ -957,6 +1230,29 @@ class TestImageAnalysisCacheUnit:
         # Original in cache should be unchanged
         assert cache.get("key1")["brightness_score"] == 42
 
+    def test_cache_stores_read_only_nested_values(self):
+        """Nested values are frozen on set(), so later caller mutations don't leak in."""
+        cache = ImageAnalysisCache()
+        original = {
+            "histogram": [{"range": "0-25", "percent": 10.0}],
+            "level_counts": np.arange(4),
+        }
+        cache.set("key1", original)
+        original["histogram"][0]["percent"] = 0.0
+        original["level_counts"][0] = 99
+
+        result = cache.get("key1")
+        assert result["histogram"] == [{"range": "0-25", "percent": 10.0}]
+        assert isinstance(result["histogram"], list)
+        np.testing.assert_array_equal(result["level_counts"], np.arange(4))
+
+        with pytest.raises(TypeError):
+            result["histogram"][0]["percent"] = 0.0
+        with pytest.raises(TypeError):
+            result["histogram"].append({})
+        with pytest.raises(ValueError):
+            result["level_counts"][0] = 99
+
     def test_cache_lru_eviction(self):
         """Cache should evict the least-recently-used entry when max_size is exceeded."""
         cache = ImageAnalysisCache(max_size=2)
@@ -968,6 +1264,44 @@ class TestImageAnalysisCacheUnit:
         assert cache.get("b") is not None
         assert cache.get("c") is not None
 
+    def test_cache_get_refreshes_lru_order(self):
+        """A cache hit makes the entry most recently used, so it outlives older ones."""
+        cache = ImageAnalysisCache(max_size=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        assert cache.get("a") is not None
+        cache.set("c", {"v": 3})  # Should evict "b", not the recently read "a"
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_cache_concurrent_get_and_set(self):
+        """Concurrent hits, misses and evictions keep the cache consistent."""
+        cache = ImageAnalysisCache(max_size=8)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    key = str((i + offset) % 16)
+                    cache.set(key, {"v": key})
+                    result = cache.get(key)
+                    assert result is None or result["v"] == key
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert cache.size <= 8
+        # Hits never leave marks behind for keys that were evicted meanwhile
+        assert cache._referenced <= cache._store.keys()
+
     def test_cache_ttl_expiry(self):
         """Entries older than ttl_seconds should be treated as misses."""
         import time
@@ -995,6 +1329,20 @@ class TestImageAnalysisCacheUnit:
         k2 = compute_cache_key(metrics=metrics, edge_mode="all", image_bytes=data)
         assert k1 == k2
 
+    def test_cache_keys_are_128_bit(self):
+        """Cache and content keys are 128-bit digests (32 hex characters)."""
+        assert len(compute_cache_key({"brightness"}, None, url="https://example.com/a.png")) == 32
+        assert len(compute_content_key(b"image data")) == 32
+        assert len(new_content_hasher().hexdigest()) == 32
+
+    def test_incremental_content_hash_matches_content_key(self):
+        """Hashing content chunk by chunk should yield the same key as hashing it whole."""
+        data = bytes(range(256)) * 1000
+        hasher = new_content_hasher()
+        for start in range(0, len(data), 65536):
+            hasher.update(data[start : start + 65536])
+        assert hasher.hexdigest() == compute_content_key(data)
+
     def test_compute_cache_key_differs_on_content(self):
         """Different image bytes should produce different keys."""
         k1 = compute_cache_key(metrics={"brightness"}, edge_mode=None, image_bytes=b"image_a")
@@ -1050,6 +1398,27 @@ class TestImageAnalysisCacheUnit:
 
         assert key_1 == key_2
 
+    def test_compute_cache_key_accepts_precomputed_content_key(self):
+        """A precomputed content key should give the same key as the raw bytes."""
+        image_bytes = b"same image content"
+        metrics = {"brightness", "histogram"}
+
+        from_bytes = compute_cache_key(metrics=metrics, edge_mode="all", image_bytes=image_bytes)
+        from_key = compute_cache_key(
+            metrics=metrics, edge_mode="all", content_key=compute_content_key(image_bytes)
+        )
+
+        assert from_bytes == from_key
+
+    def test_compute_cache_key_requires_exactly_one_identifier(self):
+        """Passing several identifiers, or none, should raise ValueError."""
+        with pytest.raises(ValueError):
+            compute_cache_key(metrics={"brightness"}, edge_mode=None)
+        with pytest.raises(ValueError):
+            compute_cache_key(
+                metrics={"brightness"}, edge_mode=None, image_bytes=b"img", content_key="abc"
+            )
+
     def test_compute_cache_key_url_vs_upload_different(self):
         """URL and upload requests with same content have different cache keys."""
         content = b"img"
@@ -1097,6 +1466,28 @@ class TestCacheDisabledBehavior:
             files={"image": ("test.png", gray_image, "image/png")},
         )
         assert _cache.size == 0
+        assert _stats_cache.size == 0
+
+    def test_edge_mode_matches_cached_path_when_disabled(
+        self, client, sample_color_image, monkeypatch
+    ):
+        """Computing only the requested edge mode should match the all-modes cached path."""
+        from app.config import Settings
+
+        image_bytes = sample_color_image.getvalue()
+        url = "/v1/image/analysis?edge_mode=top_bottom"
+
+        enabled = client.post(
+            url, files={"image": ("test.jpg", io.BytesIO(image_bytes), "image/jpeg")}
+        ).json()
+
+        monkeypatch.setattr("app.api.image_analysis.settings", Settings(CACHE_ENABLED=False))
+        disabled = client.post(
+            url, files={"image": ("test.jpg", io.BytesIO(image_bytes), "image/jpeg")}
+        ).json()
+
+        assert disabled["edge_average_luminance"] == enabled["edge_average_luminance"]
+        assert disabled["edge_brightness_score"] == enabled["edge_brightness_score"]
 
     def test_url_endpoint_cached_field_false_when_cache_disabled(
         self, client, httpx_mock, create_test_image, monkeypatch
@@ -1119,3 +1510,61 @@ class TestCacheDisabledBehavior:
         data = response.json()
         assert "cached" in data
         assert data["cached"] is False
+
+
+class TestFastStatsBehavior:
+    """Test API behavior when FAST_STATS sampling is enabled."""
+
+    def test_fast_stats_matches_exact_for_uniform_image(
+        self, client, create_test_image, monkeypatch
+    ):
+        """Sampled statistics equal the exact ones when every pixel is the same."""
+        from app.config import Settings
+
+        monkeypatch.setattr("app.api.image_analysis.settings", Settings(FAST_STATS=True))
+        img = create_test_image(color=(100, 100, 100), size=(201, 151))
+
+        response = client.post(
+            "/v1/image/analysis?metrics=brightness,median,histogram&edge_mode=all",
+            files={"image": ("test.png", img, "image/png")},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["average_luminance"] == 100.0
+        assert data["median_luminance"] == 100.0
+        assert data["edge_average_luminance"] == 100.0
+        # Original dimensions are still reported
+        assert data["width"] == 201
+        assert data["height"] == 151
+
+    def _analyze_alternating_rows(self, client, monkeypatch, fast_stats):
+        """Analyze 64x64 alternating black and gray (200) rows, uncached."""
+        from app.config import Settings
+
+        monkeypatch.setattr(
+            "app.api.image_analysis.settings",
+            Settings(FAST_STATS=fast_stats, CACHE_ENABLED=False),
+        )
+        pixels = np.zeros((64, 64, 3), dtype=np.uint8)
+        pixels[1::2] = 200
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+
+        response = client.post(
+            "/v1/image/analysis?metrics=brightness,median",
+            files={"image": ("rows.png", buffer.getvalue(), "image/png")},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_fast_stats_reports_sampled_value(self, client, monkeypatch):
+        """Sampling every 2nd row of alternating rows sees only the black ones."""
+        data = self._analyze_alternating_rows(client, monkeypatch, fast_stats=True)
+        assert data["average_luminance"] == 0.0
+        assert data["median_luminance"] == 0.0
+
+    def test_exact_stats_report_full_image_value(self, client, monkeypatch):
+        """Without FAST_STATS every row counts, so the same image averages to 100."""
+        data = self._analyze_alternating_rows(client, monkeypatch, fast_stats=False)
+        assert data["average_luminance"] == 100.0
+        assert data["median_luminance"] == 100.0
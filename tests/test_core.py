@@ -1,19 +1,32 @@
 """Tests for core modules."""
 
+import asyncio
+import io
+
+import httpcore
+import httpx
 import numpy as np
 import pytest
+from fastapi import HTTPException, UploadFile
 from PIL import Image
+from starlette.datastructures import Headers
 
-from app.config import settings
-from app.core.histogram import calculate_histogram
+from app.config import Settings, settings
+from app.core import url_handler
+from app.core.histogram import calculate_histogram, calculate_histogram_from_counts
 from app.core.luminance import (
     calculate_average_luminance,
+    calculate_average_luminance_from_counts,
     calculate_brightness_score,
     calculate_edge_luminance,
+    calculate_edge_luminance_sum,
     calculate_luminance,
+    calculate_luminance_counts,
     calculate_median_luminance,
+    calculate_median_luminance_from_counts,
 )
-from app.core.resize import resize_image_if_needed
+from app.core.resize import request_scaled_decode, resize_image_if_needed
+from app.core.validators import validate_edge_mode, validate_image_upload, validate_metrics
 
 
 class TestLuminance:
@@ -41,8 +54,9 @@ class TestLuminance:
         luminance = calculate_luminance(arr)
 
         # Expected: 0.2126*100 + 0.7152*150 + 0.0722*50 = 21.26 + 107.28 + 3.61 = 132.15
-        expected = 0.2126 * 100 + 0.7152 * 150 + 0.0722 * 50
-        assert abs(luminance[0, 0] - expected) < 0.01
+        # rounded to the nearest 8-bit level
+        assert luminance.dtype == np.uint8
+        assert luminance[0, 0] == 132
 
     def test_calculate_average_luminance(self):
         """Test average luminance calculation."""
@@ -50,6 +64,12 @@ class TestLuminance:
         avg = calculate_average_luminance(luminance)
         assert avg == 150.0
 
+    def test_calculate_average_luminance_uint8_exact(self):
+        """Test average of 8-bit luminance is exact without overflow."""
+        luminance = np.full((2000, 2000), 255, dtype=np.uint8)
+        luminance[0, 0] = 0
+        assert calculate_average_luminance(luminance) == (255 * 4_000_000 - 255) / 4_000_000
+
     def test_calculate_median_luminance(self):
         """Test median luminance calculation."""
         luminance = np.array([[10, 20], [30, 100]], dtype=np.float64)
@@ -57,6 +77,11 @@ class TestLuminance:
         # Sorted: 10, 20, 30, 100 -> median = (20 + 30) / 2 = 25
         assert median == 25.0
 
+    def test_calculate_median_luminance_odd_count(self):
+        """Test median of an odd number of pixels is the middle value."""
+        luminance = np.array([[200, 10, 90]], dtype=np.uint8)
+        assert calculate_median_luminance(luminance) == 90.0
+
     def test_calculate_brightness_score_black(self):
         """Test brightness score for black is 0."""
         assert calculate_brightness_score(0.0) == 0
@@ -71,6 +96,53 @@ class TestLuminance:
         assert calculate_brightness_score(127.5) == 50
 
 
+class TestLuminanceCounts:
+    """Test metrics derived from per-level luminance counts."""
+
+    def test_luminance_counts_length_and_total(self):
+        """Test counts cover every 8-bit level and every pixel."""
+        luminance = np.random.randint(0, 256, (30, 40), dtype=np.uint8)
+        counts = calculate_luminance_counts(luminance)
+        assert len(counts) == settings.LUMINANCE_MAX + 1
+        assert counts.sum() == luminance.size
+
+    def test_average_from_counts_matches_direct(self):
+        """Test average from counts equals the direct mean."""
+        luminance = np.random.randint(0, 256, (30, 40), dtype=np.uint8)
+        counts = calculate_luminance_counts(luminance)
+        assert calculate_average_luminance_from_counts(counts) == pytest.approx(
+            calculate_average_luminance(luminance)
+        )
+
+    def test_median_from_counts_matches_direct(self):
+        """Test median from counts equals the direct median for odd and even sizes."""
+        for shape in [(1, 1), (2, 2), (5, 7), (30, 40)]:
+            luminance = np.random.randint(0, 256, shape, dtype=np.uint8)
+            counts = calculate_luminance_counts(luminance)
+            expected = float(np.median(luminance))
+            assert calculate_median_luminance_from_counts(counts) == expected
+            assert calculate_median_luminance(luminance) == expected
+            # The selection path for non-8-bit input agrees as well
+            assert calculate_median_luminance(luminance.astype(np.float64)) == expected
+
+    def test_histogram_from_counts_matches_direct(self):
+        """Test histogram from counts equals the histogram of the array."""
+        luminance = np.random.randint(0, 256, (30, 40), dtype=np.uint8)
+        counts = calculate_luminance_counts(luminance)
+        assert calculate_histogram_from_counts(counts) == calculate_histogram(luminance)
+
+    def test_luminance_accepts_read_only_input(self):
+        """Test luminance never writes to its input, so PIL's buffer can be aliased."""
+        img = Image.new("RGB", (64, 48), color=(10, 200, 30))
+        rgb = np.asarray(img)
+        assert not rgb.flags.writeable
+
+        luminance = calculate_luminance(rgb)
+
+        assert luminance.shape == (48, 64)
+        assert calculate_luminance_counts(luminance).sum() == 64 * 48
+
+
 class TestResize:
     """Test image resizing functions."""
 
@@ -104,25 +176,62 @@ class TestResize:
 
         assert abs(original_ratio - result_ratio) < 0.01
 
+    def test_large_downscale_matches_full_lanczos(self):
+        """Test the box pre-reduction for large downscales stays close to plain LANCZOS."""
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 256, size=(300, 400, 3), dtype=np.uint8)
+        img = Image.fromarray(noise).resize((4000, 3000), Image.Resampling.BILINEAR)
+
+        result = resize_image_if_needed(img)
+        reference = img.resize(result.size, Image.Resampling.LANCZOS)
+
+        assert result.size == (512, 384)
+        difference = np.asarray(result, dtype=np.float64) - np.asarray(reference, dtype=np.float64)
+        assert abs(difference.mean()) < 0.5
+        assert np.abs(difference).max() <= 8
+
     def test_exact_boundary(self):
         """Test image at exact MAX_DIMENSION boundary."""
         img = Image.new("RGB", (512, 512))
         result = resize_image_if_needed(img)
         assert result.size == (512, 512)
 
+    def test_scaled_decode_jpeg(self):
+        """Test that large JPEGs decode at reduced scale, still above the target."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (2048, 1536), color=(90, 120, 150)).save(buffer, format="JPEG")
+
+        img = Image.open(io.BytesIO(buffer.getvalue()))
+        request_scaled_decode(img)
+        img.load()
+
+        assert img.size == (512, 384)
+        assert resize_image_if_needed(img).size == (512, 384)
+
+    def test_scaled_decode_ignores_small_jpeg(self):
+        """Test that JPEGs within bounds decode at full size."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (300, 200)).save(buffer, format="JPEG")
+
+        img = Image.open(io.BytesIO(buffer.getvalue()))
+        request_scaled_decode(img)
+        img.load()
+
+        assert img.size == (300, 200)
+
 
 class TestHistogram:
     """Test histogram calculation functions."""
 
     def test_histogram_bucket_count(self):
         """Test histogram returns correct number of buckets."""
-        luminance = np.random.uniform(0, 255, (100, 100))
+        luminance = np.random.randint(0, 256, (100, 100), dtype=np.uint8)
         histogram = calculate_histogram(luminance)
         assert len(histogram) == settings.HISTOGRAM_BUCKETS
 
     def test_histogram_percentages_sum_to_100(self):
         """Test histogram percentages sum to approximately 100."""
-        luminance = np.random.uniform(0, 255, (100, 100))
+        luminance = np.random.randint(0, 256, (100, 100), dtype=np.uint8)
         histogram = calculate_histogram(luminance)
         total = sum(bucket["percent"] for bucket in histogram)
         assert abs(total - 100.0) <= 2.0  # Allow for rounding across 10 buckets
@@ -130,7 +239,7 @@ class TestHistogram:
     def test_histogram_uniform_distribution(self):
         """Test histogram of uniformly distributed values."""
         # Create values evenly distributed across range
-        values = np.linspace(0, 255, 10000).reshape(100, 100)
+        values = np.linspace(0, 255, 10000).round().astype(np.uint8).reshape(100, 100)
         histogram = calculate_histogram(values)
 
         # Each bucket should have roughly 10%
@@ -140,7 +249,7 @@ class TestHistogram:
     def test_histogram_concentrated(self):
         """Test histogram with concentrated values."""
         # All values in middle range
-        luminance = np.full((100, 100), 128.0)
+        luminance = np.full((100, 100), 128, dtype=np.uint8)
         histogram = calculate_histogram(luminance)
 
         # Find the bucket containing 128
@@ -152,7 +261,7 @@ class TestHistogram:
 
     def test_histogram_bucket_ranges(self):
         """Test histogram bucket ranges are correct."""
-        luminance = np.zeros((10, 10))
+        luminance = np.zeros((10, 10), dtype=np.uint8)
         histogram = calculate_histogram(luminance)
 
         # First bucket should start at 0
@@ -160,9 +269,17 @@ class TestHistogram:
         # Last bucket should end at 255
         assert histogram[-1]["range"].endswith("255")
 
+    def test_histogram_bucket_boundaries_match_ranges(self):
+        """Test each luminance level is counted in the bucket whose range contains it."""
+        for bucket_index, bucket in enumerate(calculate_histogram(np.zeros((1, 1), np.uint8))):
+            start, end = (int(v) for v in bucket["range"].split("-"))
+            for level in (start, end):
+                histogram = calculate_histogram(np.full((2, 2), level, dtype=np.uint8))
+                assert histogram[bucket_index]["percent"] == 100.0
+
     def test_histogram_empty_image(self):
         """Test histogram handles empty arrays gracefully."""
-        luminance = np.array([]).reshape(0, 0)
+        luminance = np.array([], dtype=np.uint8).reshape(0, 0)
         histogram = calculate_histogram(luminance)
         assert histogram == []
 
@@ -243,6 +360,23 @@ class TestEdgeLuminance:
             edge_values = calculate_edge_luminance(luminance, mode)
             assert edge_values.mean() == 200.0
 
+    def test_edge_luminance_sum_matches_extraction(self):
+        """Test that the view-based sum matches the extracted edge pixels."""
+        luminance = np.random.randint(0, 256, (97, 131), dtype=np.uint8)
+
+        for mode in ["left_right", "top_bottom", "all"]:
+            edge_values = calculate_edge_luminance(luminance, mode)
+            total, count = calculate_edge_luminance_sum(luminance, mode)
+            assert count == edge_values.size
+            assert total == int(edge_values.sum(dtype=np.int64))
+
+    def test_edge_luminance_sum_invalid_mode(self):
+        """Test invalid edge mode raises ValueError for the sum as well."""
+        luminance = np.zeros((100, 100), dtype=np.uint8)
+
+        with pytest.raises(ValueError):
+            calculate_edge_luminance_sum(luminance, "invalid_mode")
+
     def test_edge_luminance_percentage_extraction(self):
         """Test that exactly 10% of width/height is extracted."""
         # 200x100 image
@@ -261,3 +395,230 @@ class TestEdgeLuminance:
         # Bottom: 10 rows * 200 cols = 2000
         # Total: 4000 pixels
         assert len(edge_values) == 4000
+
+
+class TestValidators:
+    """Test query parameter validators."""
+
+    def test_validate_metrics_returns_frozenset(self):
+        """Test parsed metrics are immutable so memoized results cannot be altered."""
+        result = validate_metrics(" Brightness ,median")
+        assert result == frozenset({"brightness", "median"})
+        assert isinstance(result, frozenset)
+
+    def test_validate_metrics_is_memoized(self):
+        """Test repeated query strings return the cached result."""
+        assert validate_metrics("histogram,median") is validate_metrics("histogram,median")
+
+    def test_validate_metrics_invalid_raises_every_time(self):
+        """Test invalid metrics are rejected on every call, not cached."""
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                validate_metrics("brightness,bogus")
+
+    def test_upload_without_declared_size_is_read_only_past_the_limit(self):
+        """Test an oversized upload with no declared size is rejected after a bounded read."""
+        buffer = io.BytesIO(b"\x89PNG\r\n\x1a\n" + bytes(settings.MAX_FILE_SIZE))
+        upload = UploadFile(file=buffer, headers=Headers({"content-type": "image/png"}))
+        assert upload.size is None
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(validate_image_upload(upload))
+
+        assert exc_info.value.status_code == 413
+        assert buffer.tell() == settings.MAX_FILE_SIZE + 1
+
+    def test_validate_edge_mode_normalizes(self):
+        """Test edge mode is stripped and lowercased."""
+        assert validate_edge_mode(" ALL ") == "all"
+        assert validate_edge_mode(None) is None
+
+
+class TestUrlHandler:
+    """Test the download client lifecycle."""
+
+    def test_download_client_never_stores_cookies(self):
+        """Test cookies set by one image host cannot leak into later downloads."""
+        client = url_handler._new_http_client(5.0)
+        response = httpx.Response(
+            200,
+            headers={"set-cookie": "session=abc; Path=/"},
+            request=httpx.Request("GET", "https://example.com/a.png"),
+        )
+        client.cookies.extract_cookies(response)
+        assert len(client.cookies.jar) == 0
+
+    def test_app_lifespan_opens_and_closes_shared_client(self, isolated_http_client):
+        """Test the shared download client exists only while the app runs."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        with TestClient(app):
+            assert isinstance(url_handler._http_client, httpx.AsyncClient)
+        assert url_handler._http_client is None
+
+    def test_open_http_client_prewarms_configured_hosts(self, monkeypatch, isolated_http_client):
+        """Test configured hosts are connected to at startup."""
+        monkeypatch.setattr(
+            url_handler, "settings", Settings(PREWARM_HOSTS=("a.example.com", "down.example.com"))
+        )
+        requested = []
+
+        def handler(request):
+            requested.append((request.method, request.url.host))
+            if request.url.host == "down.example.com":
+                raise httpx.ConnectError("unreachable", request=request)
+            return httpx.Response(200)
+
+        monkeypatch.setattr(
+            url_handler,
+            "_new_http_client",
+            lambda timeout: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        async def open_and_close():
+            await url_handler.open_http_client()
+            await url_handler.close_http_client()
+
+        asyncio.run(open_and_close())
+
+        assert sorted(requested) == [("HEAD", "a.example.com"), ("HEAD", "down.example.com")]
+
+    def test_download_backend_connects_to_checked_address(self, monkeypatch):
+        """Test the download backend connects to the address it checked, not the hostname."""
+        backend = url_handler._PublicAddressBackend()
+        connected = []
+
+        async def fake_connect_tcp(host, port, **kwargs):
+            connected.append((host, port))
+            return "stream"
+
+        monkeypatch.setattr(backend._backend, "connect_tcp", fake_connect_tcp)
+
+        stream = asyncio.run(backend.connect_tcp("images.example.com", 443, timeout=5.0))
+
+        assert stream == "stream"
+        assert connected == [("93.184.216.34", 443)]
+
+    def test_download_backend_blocks_private_resolution(self, monkeypatch):
+        """Test the download backend refuses hosts resolving to a private address."""
+        backend = url_handler._PublicAddressBackend()
+
+        async def resolve_to_private(hostname):
+            return ("93.184.216.34", "10.0.0.5")
+
+        async def fail_connect_tcp(host, port, **kwargs):
+            raise AssertionError("must not connect")
+
+        monkeypatch.setattr(url_handler, "_resolve_host", resolve_to_private)
+        monkeypatch.setattr(backend._backend, "connect_tcp", fail_connect_tcp)
+
+        with pytest.raises(url_handler._BlockedAddressError):
+            asyncio.run(backend.connect_tcp("rebind.example.com", 443, timeout=5.0))
+
+    def test_download_backend_caches_checked_addresses(self, monkeypatch):
+        """Test checked addresses are reused until they expire."""
+        backend = url_handler._PublicAddressBackend()
+        resolved = []
+        connected = []
+
+        async def fake_resolve(hostname):
+            resolved.append(hostname)
+            return ("93.184.216.34",)
+
+        async def fake_connect_tcp(host, port, **kwargs):
+            connected.append(host)
+            return "stream"
+
+        monkeypatch.setattr(url_handler, "_resolve_host", fake_resolve)
+        monkeypatch.setattr(backend._backend, "connect_tcp", fake_connect_tcp)
+
+        async def connect_twice():
+            for _ in range(2):
+                await backend.connect_tcp("images.example.com", 443, timeout=5.0)
+
+        asyncio.run(connect_twice())
+        assert resolved == ["images.example.com"]
+        assert connected == ["93.184.216.34"] * 2
+
+        # Expired entries are resolved (and checked) again
+        monkeypatch.setattr(url_handler, "_DNS_CACHE_TTL", 0.0)
+        backend._addresses.clear()
+        asyncio.run(connect_twice())
+        assert resolved == ["images.example.com"] * 3
+
+    def test_download_backend_never_caches_blocked_addresses(self, monkeypatch):
+        """Test a host that turns private is blocked, even after a public answer was cached."""
+        backend = url_handler._PublicAddressBackend()
+        answers = iter([("93.184.216.34",), ("10.0.0.5",), ("10.0.0.5",)])
+
+        async def rebinding_resolve(hostname):
+            return next(answers)
+
+        async def fake_connect_tcp(host, port, **kwargs):
+            return "stream"
+
+        monkeypatch.setattr(url_handler, "_resolve_host", rebinding_resolve)
+        monkeypatch.setattr(url_handler, "_DNS_CACHE_TTL", 0.0)
+        monkeypatch.setattr(backend._backend, "connect_tcp", fake_connect_tcp)
+
+        asyncio.run(backend.connect_tcp("rebind.example.com", 443, timeout=5.0))
+        for _ in range(2):
+            with pytest.raises(url_handler._BlockedAddressError):
+                asyncio.run(backend.connect_tcp("rebind.example.com", 443, timeout=5.0))
+        assert "rebind.example.com" not in backend._addresses
+
+    def test_download_client_blocks_private_resolution(self, monkeypatch):
+        """Test download clients check resolved addresses; fails if pinning is bypassed."""
+
+        async def resolve_to_private(hostname):
+            return ("10.0.0.5",)
+
+        monkeypatch.setattr(url_handler, "_resolve_host", resolve_to_private)
+
+        async def download():
+            async with url_handler._new_http_client(5.0) as client:
+                await client.get("https://rebind.example.com/image.png")
+
+        with pytest.raises(url_handler._BlockedAddressError):
+            asyncio.run(download())
+
+    def test_download_client_dials_checked_address(self, monkeypatch):
+        """Test download clients connect to the checked address, with httpx errors."""
+        connected = []
+
+        async def refuse_connect_tcp(backend, host, port, **kwargs):
+            connected.append((host, port))
+            raise httpcore.ConnectError("refused")
+
+        monkeypatch.setattr(httpcore.AnyIOBackend, "connect_tcp", refuse_connect_tcp)
+
+        async def download():
+            async with url_handler._new_http_client(5.0) as client:
+                await client.get("https://images.example.com/image.png")
+
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(download())
+        assert connected == [("93.184.216.34", 443)]
+
+    def test_downloads_per_host_are_limited(self, monkeypatch):
+        """Test concurrent downloads from one host wait for a free slot."""
+        monkeypatch.setattr(url_handler, "settings", Settings(MAX_DOWNLOADS_PER_HOST=2))
+        active = []
+        peak = []
+
+        async def download():
+            async with url_handler._host_download_slot("images.example.com"):
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+
+        async def download_many():
+            await asyncio.gather(*(download() for _ in range(5)))
+
+        asyncio.run(download_many())
+
+        assert max(peak) == 2
+        assert url_handler._host_slots == {}